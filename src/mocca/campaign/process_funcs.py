@@ -15,7 +15,8 @@ from mocca.chromatogram.assign import (assign_peaks_compound,
                                        assign_peaks_react)
 from mocca.chromatogram.quantify import quantify_peaks
 
-from mocca.campaign.utils import check_istd
+from mocca.campaign.utils import (check_istd, get_baseline_params,
+                                  get_dad_data_params, prefetch)
 from mocca.campaign.experiment_funcs import (get_sorted_compound_experiments,
                                              get_unprocessed_experiments)
 from mocca.user_interaction.user_objects import HplcInput
@@ -33,23 +34,46 @@ def process_gradients(experiments, settings):
                                  exp.gradient.path == e.gradient.path),
                                 None)
         if gradient_dataset is None:
-            exp.gradient.dataset = GradientData(settings.hplc_system_tag,
-                                                HplcInput(exp.gradient.path, None),
-                                                settings.wl_high_pass,
-                                                settings.wl_low_pass)
+            exp.gradient.dataset = GradientData(
+                settings.hplc_system_tag,
+                HplcInput(exp.gradient.path, None),
+                baseline_params=get_baseline_params(settings),
+                cache_dir=settings.cache_dir,
+                compact=settings.compact_gradients,
+                **get_dad_data_params(settings)
+                )
         else:
             exp.gradient.dataset = gradient_dataset
 
 
-def preprocess_experiment(exp, quali_comp_db, settings):
+def read_compound_data(exp, settings):
+    """
+    Reads and baseline-corrects the HPLC-DAD data of the given experiment.
+    """
+    return CompoundData(settings.hplc_system_tag, exp,
+                        **get_dad_data_params(settings))
+
+
+def read_compound_data_ahead(experiments, settings):
+    """
+    Yields the experiments together with their compound data in the given
+    order. If prefetching is enabled in the settings, the data of the next
+    experiments are read in the background while the current experiment is
+    processed.
+    """
+    return prefetch(lambda exp: read_compound_data(exp, settings), experiments,
+                    settings.prefetch)
+
+
+def preprocess_experiment(exp, quali_comp_db, settings, compound_data=None):
     """
     Returns a chromatogram object created out of the given experiment.
     The peaks in the chromatogram already have assigned possible matches
-    but they are not yet assigned or quantified.
+    but they are not yet assigned or quantified. If the compound data of the
+    experiment were already read, they can be given.
     """
-    compound_data = CompoundData(settings.hplc_system_tag, exp,
-                                 wl_high_pass=settings.wl_high_pass,
-                                 wl_low_pass=settings.wl_low_pass)
+    if compound_data is None:
+        compound_data = read_compound_data(exp, settings)
     chromatogram = pick_peaks(compound_data, exp, settings.absorbance_threshold,
                               settings.peaks_high_pass,
                               settings.peaks_low_pass)
@@ -64,11 +88,12 @@ def preprocess_experiment(exp, quali_comp_db, settings):
     return chromatogram
 
 
-def process_compound_exp(exp, quali_comp_db, settings):
+def process_compound_exp(exp, quali_comp_db, settings, compound_data=None):
     """
     Processes one compound experiment.
     """
-    chromatogram = preprocess_experiment(exp, quali_comp_db, settings)
+    chromatogram = preprocess_experiment(exp, quali_comp_db, settings,
+                                         compound_data)
     chromatogram = assign_peaks_compound(chromatogram, exp.compound)
     return chromatogram
 
@@ -82,8 +107,9 @@ def process_compound_experiments(experiments, peak_db, quali_comp_db,
     """
     exps = get_sorted_compound_experiments(experiments)
     chroms = []
-    for exp in exps:
-        chrom = process_compound_exp(exp, quali_comp_db, settings)
+    for exp, compound_data in read_compound_data_ahead(exps, settings):
+        chrom = process_compound_exp(exp, quali_comp_db, settings,
+                                     compound_data)
         if not chrom.bad_data:
             chrom = check_istd(exp, chrom)
         chroms.append(chrom)
@@ -115,8 +141,10 @@ def process_experiments(experiments, peak_db, quali_comp_db, quant_comp_db,
     """
     unprocessed_exps = get_unprocessed_experiments(experiments, quali_comp_db)
     chroms = []
-    for exp in unprocessed_exps:
-        chrom = preprocess_experiment(exp, quali_comp_db, settings)
+    for exp, compound_data in read_compound_data_ahead(unprocessed_exps,
+                                                       settings):
+        chrom = preprocess_experiment(exp, quali_comp_db, settings,
+                                      compound_data)
         chrom = assign_peaks_react(chrom, peak_db)
         chrom = quantify_peaks(chrom, quant_comp_db, quali_comp_db)
         chrom = check_istd(exp, chrom)
@@ -5,6 +5,11 @@ Created on Mon Dec 13 15:47:14 2021
 
 @author: haascp
 """
+import os
+import tempfile
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 
 def check_istd(exp, chrom):
@@ -17,3 +22,96 @@ def check_istd(exp, chrom):
             if not any([peak.compound_id == istd.key for peak in chrom]):
                 chrom.bad_data = True
     return chrom
+
+
+def get_baseline_params(settings):
+    """
+    Returns the keyword arguments for the gradient baseline algorithm as given
+    in the settings.
+    """
+    return {'lam': settings.baseline_lam,
+            'p': settings.baseline_p,
+            'niter': settings.baseline_niter,
+            'backend': settings.baseline_backend,
+            'n_jobs': settings.baseline_n_jobs,
+            'use_processes': settings.baseline_use_processes}
+
+
+def get_raw_cache_dir(settings):
+    """
+    Returns the directory in which parsed raw data are cached or None if
+    raw data caching is not enabled in the settings.
+    """
+    if settings.cache_dir and settings.cache_raw_data:
+        return settings.cache_dir
+    return None
+
+
+def get_lazy_dir(settings):
+    """
+    Returns the directory in which memory-mapped DAD data are stored or None if
+    lazy data loading is not enabled in the settings. Uses the cache directory
+    if given and the temporary directory of the system otherwise.
+    """
+    if not settings.lazy_data:
+        return None
+    if settings.cache_dir:
+        return os.path.join(settings.cache_dir, 'lazy')
+    return os.path.join(tempfile.gettempdir(), 'mocca_lazy')
+
+
+def get_resample_params(settings):
+    """
+    Returns the resampling method and time step of the common time grid and
+    the time binning parameters or None if neither time resampling nor time
+    binning is enabled in the settings.
+    """
+    if not settings.time_resampling and settings.time_bin_factor == 1:
+        return None
+    return {'method': settings.time_resampling,
+            'time_step': settings.time_step,
+            'bin_factor': int(settings.time_bin_factor),
+            'binning': settings.time_binning}
+
+
+def get_dad_data_params(settings):
+    """
+    Returns the keyword arguments for the creation of DAD data containers as
+    given in the settings.
+    """
+    return {'wl_high_pass': settings.wl_high_pass,
+            'wl_low_pass': settings.wl_low_pass,
+            'raw_cache_dir': get_raw_cache_dir(settings),
+            'lazy_dir': get_lazy_dir(settings),
+            'dtype': settings.dtype,
+            'resample_params': get_resample_params(settings)}
+
+
+def prefetch(func, items, n_prefetch=0):
+    """
+    Yields the tuples (item, func(item)) for all items in the given order. If
+    n_prefetch is larger than 0, the results of the next n_prefetch items are
+    computed ahead in background threads while the current result is
+    processed. At most n_prefetch results are computed ahead, which caps the
+    memory usage.
+    """
+    if n_prefetch <= 0:
+        for item in items:
+            yield item, func(item)
+        return
+
+    items = iter(items)
+    executor = ThreadPoolExecutor(max_workers=n_prefetch)
+    futures = deque((item, executor.submit(func, item)) for item in
+                    itertools.islice(items, n_prefetch))
+    try:
+        while futures:
+            item, future = futures.popleft()
+            for next_item in itertools.islice(items, 1):
+                futures.append((next_item, executor.submit(func, next_item)))
+            yield item, future.result()
+    finally:
+        # stop reading ahead if the consumer stops early or an error occurs
+        for _, future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
@@ -5,84 +5,60 @@ Created on Thu May 12 09:10:57 2022
 @author: CPH
 """
 
+import threading
 import numpy as np
-import pandas as pd
 
-from mocca.dad_data.utils import df_to_array, apply_filter
+from mocca.dad_data.utils import (get_time_vector, apply_array_filter,
+                                  get_filter_slices)
+from mocca.dad_data.cache import get_file_stamp
 
+AFR_UVVIS_DATASET = 'http://purl.allotrope.org/ontologies/result#AFR_0001527'
+HDF_MAP = 'http://purl.allotrope.org/ontologies/datacube-hdf-map#'
+RDF_TYPE = 'http://www.w3.org/1999/02/22-rdf-syntax-ns#type'
 
-def get_uvvis_dataset_name(path):
+# resolved description layers of recently read adf files by file stamp,
+# guarded by a lock since runs may be read in background threads
+ADF_DESCRIPTION_CACHE = {}
+ADF_DESCRIPTION_CACHE_SIZE = 32
+ADF_DESCRIPTION_CACHE_LOCK = threading.Lock()
+
+
+def get_uvvis_dataset_name(graph):
     """
     Queries the data description layer of the adf file to find the name of the
     dataset which is of the type 'three-dimensional ultraviolet spectrum' as
     defined by the AFO.
     """
-    from h5ld import AllotropeDF
-    import h5py
     import rdflib
 
-    with h5py.File(path, mode="r") as f:
-        g = AllotropeDF(f).get_ld()
-
     datasets_query = '''SELECT ?s ?p ?o
                         WHERE { ?s ?p ?o .
                                FILTER regex(str(?o), "DataSet") .
                                }'''
-    qres = g.query(datasets_query)
+    qres = graph.query(datasets_query)
 
     datasets = [x[0] for x in qres]
     for d in datasets:
-        subj = list(g.triples((None, None, d)))[1][0]
+        subj = list(graph.triples((None, None, d)))[1][0]
         dataset = list(
-            g.triples((subj, None,
-                       rdflib.term.URIRef('http://purl.allotrope.org/ontologies/result#AFR_0001527')))  # noqa: E501
+            graph.triples((subj, None, rdflib.term.URIRef(AFR_UVVIS_DATASET)))
         )
         if dataset:
             dataset_name = d
     return dataset_name
 
 
-def read_adf_datacube(path):
-    """
-    Reads the raw data stored in the data cube layer, which are the HPLC-DAD
-    absorbance values and the time scale.
-    """
-    import h5py
-
-    with h5py.File(path, mode="r") as f:
-        data_cubes = f['data-cubes']
-        dataset_name = get_uvvis_dataset_name(path)
-        dataset_key = str(dataset_name).split(':')[1][2:].replace("/", '-')
-        uvvis_data = data_cubes[dataset_key]
-        measures = uvvis_data['measures']
-        data_idx = list(measures.keys())[0]
-        absorbance_idx = measures[data_idx]
-        absorbance = absorbance_idx[()]
-        absorbance = np.swapaxes(absorbance, 0, 1)
-
-        scales = uvvis_data['scales']
-        data_idx = list(scales.keys())[0]
-        time_idx = scales[data_idx]
-        time = time_idx[()]
-    return np.array(absorbance), list(time)
-
-
-def get_function_paramenters(path):
+def get_function_paramenters(graph, dataset_name):
     """
     Reads the parameters of the linear function which describes the wavelength
     vector out of the data description layer.
     """
-    from h5ld import AllotropeDF
-    import h5py
     import rdflib
 
-    with h5py.File(path, mode="r") as f:
-        g = AllotropeDF(f).get_ld()
-    dataset = get_uvvis_dataset_name(path)
-
     # Step 1: Extract scaleMapping from a Dataset
-    scale_mapping_id = list(g.objects(list(g.triples((None, None, dataset)))[0][0],
-                                      rdflib.term.URIRef('http://purl.allotrope.org/ontologies/datacube-hdf-map#scaleMapping')))  # noqa: E501
+    scale_mapping_id = list(graph.objects(
+        list(graph.triples((None, None, dataset_name)))[0][0],
+        rdflib.term.URIRef(HDF_MAP + 'scaleMapping')))
 
     # In case of error, i.e., there is no FunctionScaleMapping, it returns 0, 0
     param1 = 0.0
@@ -90,71 +66,119 @@ def get_function_paramenters(path):
     # Code based on the assumption that there is only one FunctionScaleMapping
     for mapping in scale_mapping_id:
         # Step 2: Looking for a Function Scale Mapping
-        mapping_function = list(g.triples((mapping,
-                                           rdflib.term.URIRef('http://www.w3.org/1999/02/22-rdf-syntax-ns#type'),  # noqa: E501
-                                           rdflib.term.URIRef('http://purl.allotrope.org/ontologies/datacube-hdf-map#FunctionScaleMapping'))))  # noqa: E501
+        mapping_function = list(graph.triples((
+            mapping, rdflib.term.URIRef(RDF_TYPE),
+            rdflib.term.URIRef(HDF_MAP + 'FunctionScaleMapping'))))
         # Step 3: Check the Index Function (contains type of function and parameters)
         # Step 4: Extract parameters
-        if(mapping_function):
-            param1 = float(list(g.objects(
-                list(g.objects(mapping,
-                               rdflib.term.URIRef('http://purl.allotrope.org/ontologies/datacube-hdf-map#indexFunction')))[0],  # noqa: E501
-                rdflib.term.URIRef('http://purl.allotrope.org/ontologies/datacube-hdf-map#parameter1')))[0])  # noqa: E501
-            param2 = float(list(g.objects(
-                list(g.objects(mapping,
-                               rdflib.term.URIRef('http://purl.allotrope.org/ontologies/datacube-hdf-map#indexFunction')))[0],  # noqa: E501
-                rdflib.term.URIRef('http://purl.allotrope.org/ontologies/datacube-hdf-map#parameter2')))[0])  # noqa: E501
+        if mapping_function:
+            index_function = list(graph.objects(
+                mapping, rdflib.term.URIRef(HDF_MAP + 'indexFunction')))[0]
+            param1 = float(list(graph.objects(
+                index_function, rdflib.term.URIRef(HDF_MAP + 'parameter1')))[0])
+            param2 = float(list(graph.objects(
+                index_function, rdflib.term.URIRef(HDF_MAP + 'parameter2')))[0])
             return param1, param2
     return param1, param2
 
 
-def read_adf_description(path, wl_len):
+def read_adf_description(file):
     """
-    Queries the adf data description layer to extract the wavlength vector.
-    For this query, the h5ld package is required which can be installed by
-    editable pip install from https://github.com/laura-dirocco/h5ld. In case there
-    are problems with installation, the user can give start and stop values
-    as set on the DAD manually.
+    Queries the adf data description layer of the opened file to extract the
+    key of the UV-Vis data cube and the parameters of the wavelength vector.
+    The RDF graph is only built once for all queries. For this query, the h5ld
+    package is required which can be installed by editable pip install from
+    https://github.com/laura-dirocco/h5ld.
     """
     try:
-        wl_slope, wl_start = get_function_paramenters(path)
-        wl_stop = wl_start + wl_len * wl_slope
-    except AttributeError:
-        print("If the h5ld package cannot be installed on your machine, "
-              "you have to give the wavelength values manually for adf data.")
+        from h5ld import AllotropeDF
+        graph = AllotropeDF(file).get_ld()
+    except (ImportError, AttributeError) as error:
+        raise ImportError("The h5ld package is required to read adf files. If "
+                          "it cannot be installed on your machine, you have "
+                          "to give the wavelength values manually for adf "
+                          "data.") from error
+    dataset_name = get_uvvis_dataset_name(graph)
+    wl_slope, wl_start = get_function_paramenters(graph, dataset_name)
+    dataset_key = str(dataset_name).split(':')[1][2:].replace("/", '-')
+    return dataset_key, wl_slope, wl_start
+
+
+def get_adf_description(file, path):
+    """
+    Returns the resolved description layer of the adf file (see
+    read_adf_description). The result is cached per file as long as the file
+    is not changed. The cache is thread-safe, the description layer is read
+    outside of the lock.
+    """
+    file_stamp = get_file_stamp(path)
+    with ADF_DESCRIPTION_CACHE_LOCK:
+        description = ADF_DESCRIPTION_CACHE.get(file_stamp)
+    if description is not None:
+        return description
+    description = read_adf_description(file)
+    with ADF_DESCRIPTION_CACHE_LOCK:
+        if file_stamp not in ADF_DESCRIPTION_CACHE:
+            while len(ADF_DESCRIPTION_CACHE) >= ADF_DESCRIPTION_CACHE_SIZE:
+                # drop the oldest entry
+                del ADF_DESCRIPTION_CACHE[next(iter(ADF_DESCRIPTION_CACHE))]
+            ADF_DESCRIPTION_CACHE[file_stamp] = description
+    return description
+
+
+def get_wavelength_vector(wl_slope, wl_start, wl_len):
+    """
+    Returns the wavelength vector described by the linear function of the
+    description layer. If no function was found, the wavelength vector starts
+    at 190 nm with a step size of 1 nm.
+    """
+    wl_stop = wl_start + wl_len * wl_slope
     if wl_start == 0 and wl_slope == 0:
         wl_start = 190
         wl_stop = wl_start + wl_len
-    wavelength = list(np.linspace(wl_start, wl_stop, wl_len))
-    return wavelength
+    return np.linspace(wl_start, wl_stop, wl_len)
 
 
-def preprocess_df(df):
+def read_adf_datacube(file, dataset_key, wl_slices=None):
     """
-    Preprocesses the df time column to be in line with the Chemstation API.
+    Reads the raw data stored in the data cube layer of the opened file, which
+    are the HPLC-DAD absorbance values and the time scale. If wavelength slices
+    are given, only these wavelengths are read from the data cube by hyperslab
+    selection.
     """
-    acq_time = df.time.max() / len(df)
-
-    # generate new time column
-    time_series = pd.Series(range(1, (len(df) + 1))).astype(float) * acq_time / 60
-    df['time'] = time_series
-    return df
-
-
-def read_adf(path, wl_high_pass=None, wl_low_pass=None):
+    uvvis_data = file['data-cubes'][dataset_key]
+    measures = uvvis_data['measures']
+    absorbance_dataset = measures[list(measures.keys())[0]]
+    if wl_slices is None:
+        absorbance = absorbance_dataset[()]
+    else:
+        absorbance = np.concatenate([absorbance_dataset[:, wl_slice] for
+                                     wl_slice in wl_slices], axis=1)
+    absorbance = np.ascontiguousarray(np.swapaxes(absorbance, 0, 1))
+
+    scales = uvvis_data['scales']
+    time = scales[list(scales.keys())[0]][()]
+    return absorbance, time
+
+
+def read_adf(path, wl_high_pass=None, wl_low_pass=None, dtype=None):
     """
-    Reads adf files as exported by the Agilent ADF Adapter.
+    Reads adf files as exported by the Agilent ADF Adapter. The file is opened
+    once and only the wavelengths required for the given wavelength window are
+    read from the data cube.
     """
-    absorbance, time = read_adf_datacube(path)
-    wavelength = read_adf_description(path, absorbance.shape[0])
-
-    df = pd.DataFrame(np.swapaxes(absorbance, 0, 1), columns=wavelength)
-    df.insert(0, "time", time)
-    df = preprocess_df(df)
-
-    df = pd.melt(df, id_vars='time', value_vars=df.columns[1:],
-                 var_name='wavelength', value_name='absorbance')
-    df['wavelength'] = df['wavelength'].astype(float)
-    df = apply_filter(df, wl_high_pass, wl_low_pass)
-    data, time, wavelength = df_to_array(df)
+    import h5py
+
+    with h5py.File(path, mode="r") as f:
+        dataset_key, wl_slope, wl_start = get_adf_description(f, path)
+        measures = f['data-cubes'][dataset_key]['measures']
+        wl_len = measures[list(measures.keys())[0]].shape[1]
+        wavelength = get_wavelength_vector(wl_slope, wl_start, wl_len)
+        wl_slices = get_filter_slices(wavelength, wl_high_pass, wl_low_pass)
+        absorbance, time = read_adf_datacube(f, dataset_key, wl_slices)
+    wavelength = np.concatenate([wavelength[wl_slice] for wl_slice in wl_slices])
+    # time in the data cube is given in seconds, MOCCA works in minutes
+    time = get_time_vector(time) / 60
+    data, wavelength = apply_array_filter(absorbance, wavelength, wl_high_pass,
+                                          wl_low_pass, dtype=dtype)
     return data, time, wavelength
@@ -5,18 +5,26 @@ Created on 06/13/22
 
 @author: haascp
 """
+import io
 import pandas as pd
 
-from mocca.dad_data.utils import df_to_array, apply_filter
+from mocca.dad_data.utils import (wide_df_to_arrays, apply_array_filter,
+                                  get_filter_index)
 
 
-def read_csv_angi(path):
+def read_csv_angi(path, wl_high_pass=None, wl_low_pass=None):
     """
     Reads the UTF-16 encoded 3D data exported by the ChemStation macro.
     Parameters
     ----------
     path : str
         The directory, in which the experimental data are stored.
+    wl_high_pass : float, optional
+        Only wavelength columns required to filter the data to wavelengths
+        above this value are parsed.
+    wl_low_pass : float, optional
+        Only wavelength columns required to filter the data to wavelengths
+        below this value are parsed.
 
     Returns
     -------
@@ -25,54 +33,20 @@ def read_csv_angi(path):
         values at the given detection wavelength in the column name.
     """
     with open(path, 'r') as f:
-        df = pd.read_csv(f)
+        columns = pd.read_csv(io.StringIO(f.readline()), nrows=0).columns
+        wl_idx = get_filter_index(columns[1:].astype(float), wl_high_pass,
+                                  wl_low_pass)
+        df = pd.read_csv(f, header=None, names=columns,
+                         usecols=[0] + list(wl_idx + 1))
     return df
 
 
-def tidy_df_agilent(dataframe, wl_high_pass=None, wl_low_pass=None):
-    """
-    Tidies the raw data obtained from reading the CSV
-
-    Parameters
-    ----------
-    dataframe : pandas.DataFrame
-        First column is time, the following columns obtain the absorbance
-        values at the given detection wavelength in the column name.
-
-    Raises
-    ------
-    ValueError
-        If acquisition rate of the DAD was not constant, this error is raised.
-
-    Returns
-    -------
-    df : pandas.DataFrame
-        Columns:
-            time: Chromatogram time
-            wavelength: Detection wavelength
-            absorbance: Absorbance value
-    """
-    df = dataframe.copy()
-    # name time column
-    df.rename(columns={df.columns[0]: 'time'}, inplace=True)
-
-    acq_time = df.time.max() / len(df)
-
-    # generate new time column
-    time_series = pd.Series(range(1, (len(df) + 1))).astype(float) * acq_time
-    df['time'] = time_series
-    df = pd.melt(df, id_vars='time', value_vars=df.columns[1:],
-                 var_name='wavelength', value_name='absorbance')
-    df['wavelength'] = df['wavelength'].astype(float)
-    return df
-
-
-def read_angi(path, wl_high_pass=None, wl_low_pass=None):
+def read_angi(path, wl_high_pass=None, wl_low_pass=None, dtype=None):
     """
     Chemstation read and processing function.
     """
-    df = read_csv_angi(path)
-    df = tidy_df_agilent(df)
-    df = apply_filter(df, wl_high_pass, wl_low_pass)
-    data, time, wavelength = df_to_array(df)
+    df = read_csv_angi(path, wl_high_pass, wl_low_pass)
+    data, time, wavelength = wide_df_to_arrays(df)
+    data, wavelength = apply_array_filter(data, wavelength, wl_high_pass,
+                                          wl_low_pass, dtype=dtype)
     return data, time, wavelength
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:32:40 2026
+
+@author: haascp
+
+Reader for the binary 3D UV files (e.g., DAD1.UV) which are stored by the
+Agilent ChemStation software in the .D directory of a run. In contrast to the
+DAD1.CSV file, no export macro has to be run in ChemStation.
+
+Layout of the files (all values little-endian if not stated otherwise):
+    0x000           file version string, '131' or '31'
+    0x15B           file type string, 'LC' (delta encoded) or 'OL' (doubles)
+    0x116           number of spectra (big-endian uint32)
+    0xC0D / 0x13E   scaling factor of the absorbance (big-endian float64)
+    0x1000 / 0x200  start of the spectra records
+
+Every spectrum record starts with a 22 byte header containing the length of
+the record (uint16 at byte 2), the time in ms (uint32 at byte 4) and the
+start, end and step of the wavelengths in 1/20 nm (3 x uint16 at byte 8).
+In delta encoded files, the absorbance values follow as int16 deltas to the
+previous value. The value -32768 marks that the next int32 is an absolute
+value.
+"""
+
+import os
+import struct
+import numpy as np
+
+from mocca.dad_data.utils import get_time_vector, apply_array_filter
+
+UV_FILE_OFFSETS = {
+    '131': {'scaling_factor': 0xC0D, 'data_start': 0x1000},
+    '31': {'scaling_factor': 0x13E, 'data_start': 0x200}
+}
+NUM_TIMES_OFFSET = 0x116
+FILE_TYPE_OFFSET = 0x15B
+RECORD_HEADER_LENGTH = 22
+DELTA_ESCAPE = -32768
+
+
+def get_uv_file_path(path):
+    """
+    Returns the path of the binary UV file in the given .D directory. DAD1.UV
+    is preferred if there are multiple UV files.
+    """
+    if os.path.isfile(path):
+        return path
+    uv_files = sorted(file_name for file_name in os.listdir(path) if
+                      file_name.lower().endswith('.uv'))
+    if not uv_files:
+        raise FileNotFoundError(f"No binary UV file found in {path}.")
+    for file_name in uv_files:
+        if file_name.lower() == 'dad1.uv':
+            return os.path.join(path, file_name)
+    return os.path.join(path, uv_files[0])
+
+
+def read_uv_string(buffer, offset, gap=1):
+    """
+    Reads a length-prefixed string of the file header. Strings of newer files
+    are stored in UTF-16 (gap of 2 bytes per character).
+    """
+    length = buffer[offset]
+    raw = bytes(buffer[offset + 1:offset + 1 + length * gap])
+    return raw[::gap].decode('ascii', errors='ignore').strip()
+
+
+def get_record_offsets(buffer, data_start, num_times):
+    """
+    Returns the offsets and lengths of all spectrum records by following the
+    record lengths given in the record headers.
+    """
+    offsets = np.empty(num_times, dtype=np.int64)
+    lengths = np.empty(num_times, dtype=np.int64)
+    offset = data_start
+    for i in range(num_times):
+        length = struct.unpack_from('<H', buffer, offset + 2)[0]
+        if length < RECORD_HEADER_LENGTH or offset + length > len(buffer):
+            raise ValueError("Corrupt or truncated binary UV file.")
+        offsets[i] = offset
+        lengths[i] = length
+        offset += length
+    return offsets, lengths
+
+
+def decode_delta_records(buffer, offsets, lengths, num_wavelengths):
+    """
+    Decodes the delta encoded absorbance values of all records at once.
+    Returns the integer absorbance values with the shape
+    [timepoints] x [# of wavelengths].
+    """
+    data_start = offsets[0]
+    words = np.frombuffer(buffer, dtype='<i2', offset=data_start,
+                          count=(offsets[-1] + lengths[-1] - data_start) // 2)
+    # word indices of the payload of all records without record headers
+    payload_starts = (offsets - data_start + RECORD_HEADER_LENGTH) // 2
+    payload_lengths = (lengths - RECORD_HEADER_LENGTH) // 2
+    payload_offsets = np.cumsum(payload_lengths) - payload_lengths
+    idx = (np.arange(payload_lengths.sum()) +
+           np.repeat(payload_starts - payload_offsets, payload_lengths))
+    payload = words[idx]
+
+    # escape words are followed by two words of an absolute int32 value which
+    # may contain the escape value themselves, so they have to be skipped
+    escapes = []
+    skip_until = -1
+    for candidate in np.flatnonzero(payload == DELTA_ESCAPE):
+        if candidate > skip_until:
+            escapes.append(candidate)
+            skip_until = candidate + 2
+    escapes = np.array(escapes, dtype=np.int64)
+    if len(escapes) and escapes[-1] + 2 >= len(payload):
+        raise ValueError("Corrupt binary UV file.")
+    absolute_values = (payload[escapes + 1].view(np.uint16).astype(np.int64) +
+                       payload[escapes + 2].astype(np.int64) * 65536)
+
+    is_token = np.ones(len(payload), dtype=bool)
+    is_token[escapes + 1] = False
+    is_token[escapes + 2] = False
+    tokens = payload[is_token].astype(np.int64)
+    if len(tokens) != len(offsets) * num_wavelengths:
+        raise ValueError("Corrupt binary UV file.")
+    escape_tokens = np.cumsum(is_token)[escapes] - 1
+    tokens[escape_tokens] = absolute_values
+
+    # running sum of the deltas which restarts at each record and at each
+    # absolute value
+    restarts = np.zeros(len(tokens), dtype=bool)
+    restarts[::num_wavelengths] = True
+    restarts[escape_tokens] = True
+    cumsum = np.cumsum(tokens)
+    restart_idx = np.maximum.accumulate(np.where(restarts,
+                                                 np.arange(len(tokens)), 0))
+    absorbance = cumsum - (cumsum[restart_idx] - tokens[restart_idx])
+    return absorbance.reshape(len(offsets), num_wavelengths)
+
+
+def decode_double_records(buffer, offsets, num_wavelengths):
+    """
+    Reads the absorbance values of files storing doubles. Returns the
+    absorbance values with the shape [timepoints] x [# of wavelengths].
+    """
+    record_length = RECORD_HEADER_LENGTH + 8 * num_wavelengths
+    return np.ndarray((len(offsets), num_wavelengths), dtype='<f8',
+                      buffer=buffer, offset=offsets[0] + RECORD_HEADER_LENGTH,
+                      strides=(record_length, 8)).astype(float)
+
+
+def read_uv_agilent(path):
+    """
+    Reads the binary 3D UV file stored by the ChemStation software.
+
+    Parameters
+    ----------
+    path : str
+        The directory, in which the experimental data are stored, or the path
+        of the UV file.
+
+    Returns
+    -------
+    data : numpy.ndarray
+        Absorbance values with the shape [# of wavelengths] x [timepoints].
+    time : numpy.ndarray
+        Time vector.
+    wavelength : numpy.ndarray
+        Wavelength vector.
+    """
+    with open(get_uv_file_path(path), 'rb') as file:
+        buffer = file.read()
+
+    version = read_uv_string(buffer, 0)
+    if version not in UV_FILE_OFFSETS:
+        raise ValueError(f"Binary UV file version {version} not supported.")
+    file_offsets = UV_FILE_OFFSETS[version]
+    num_times = struct.unpack_from('>I', buffer, NUM_TIMES_OFFSET)[0]
+    if num_times == 0:
+        raise ValueError("Binary UV file does not contain any spectra.")
+    is_double_file = (version == '131' and
+                      read_uv_string(buffer, FILE_TYPE_OFFSET, 2).startswith('OL'))
+
+    data_start = file_offsets['data_start']
+    # wavelengths are given in the header of the first record
+    wl_start, wl_end, wl_step = struct.unpack_from('<3H', buffer, data_start + 8)
+    num_wavelengths = len(range(wl_start, wl_end + 1, wl_step))
+    if is_double_file:
+        record_length = RECORD_HEADER_LENGTH + 8 * num_wavelengths
+        offsets = data_start + np.arange(num_times) * record_length
+        absorbance = decode_double_records(buffer, offsets, num_wavelengths)
+    else:
+        offsets, lengths = get_record_offsets(buffer, data_start, num_times)
+        absorbance = decode_delta_records(buffer, offsets, lengths,
+                                          num_wavelengths)
+
+    scaling_factor = struct.unpack_from('>d', buffer,
+                                        file_offsets['scaling_factor'])[0]
+    data = absorbance.T * scaling_factor
+    raw_time = np.array([struct.unpack_from('<I', buffer, offset + 4)[0] for
+                         offset in offsets]) / 60000
+    time = get_time_vector(raw_time)
+    wavelength = np.arange(wl_start, wl_end + 1, wl_step) / 20
+    return np.ascontiguousarray(data), time, wavelength
+
+
+def read_chemstation_uv(path, wl_high_pass=None, wl_low_pass=None, dtype=None):
+    """
+    Binary ChemStation UV file read and processing function.
+    """
+    data, time, wavelength = read_uv_agilent(path)
+    data, wavelength = apply_array_filter(data, wavelength, wl_high_pass,
+                                          wl_low_pass, dtype=dtype)
+    return data, time, wavelength
@@ -8,12 +8,21 @@ Created on Mon Aug 30 15:17:53 2021
 """
 
 
-def read_custom_data(experiment):
+def read_custom_data(experiment, dtype=None):
     """
-    Returns the given custom data without any preprocessing
+    Returns the given custom data without any preprocessing and without
+    copying. If a dtype is given, the data are converted to it (no copy if the
+    dtype already matches).
     """
     if experiment.custom_data is None:
         raise AttributeError("Custom data has to be given if data should be "
                              "processed with custom hplc_system_tag.")
     custom_data = experiment.custom_data
-    return custom_data.data, custom_data.time, custom_data.wavelength
+    if custom_data.consumed:
+        raise ValueError("Custom data were already modified in place during "
+                         "processing and cannot be processed again. Provide "
+                         "new custom data or set in_place to False.")
+    data = custom_data.data
+    if dtype is not None:
+        data = data.astype(dtype, copy=False)
+    return data, custom_data.time, custom_data.wavelength
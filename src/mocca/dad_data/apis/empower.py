@@ -13,46 +13,47 @@ https://support.waters.com/KB_Inf/Empower_Breeze/WKB77571_How_to_export_3D_raw\
 import numpy as np
 import pandas as pd
 
-from mocca.dad_data.utils import df_to_array, apply_filter
+from mocca.dad_data.utils import (get_time_vector, apply_array_filter,
+                                  get_filter_index)
 
 
 def read_arw_empower(path, wl_high_pass=None, wl_low_pass=None):
+    """
+    Reads the 3D data exported by the Empower software. Returns a 2D absorbance
+    array with the shape [# of wavelengths] x [timepoints] as well as a vector
+    for the time domain and a vector for the wavelength domain. The header is
+    streamed line by line until the data block is reached, which is then
+    parsed in one go by the pandas C parser. If wl_high_pass or wl_low_pass are
+    given, only the wavelength columns required to filter the data to this
+    window are parsed.
+    """
     with open(path) as file:
-        lines = file.readlines()
-        lines = [line.rstrip() for line in lines]
-
-    time_idx = [n for n, l in enumerate(lines) if l.startswith('Time')][0]
-    wl_idx = [n for n, l in enumerate(lines) if l.startswith('Wavelength')][0]
-
-    absorbance_list = []
-    time_vec = []
-    for line in lines[time_idx + 2:]:
-        line_list = line.split("\t")
-        absorbance_list.append(line_list[1:])
-        time_vec.append(line_list[0])
-
-    absorbance = np.array(absorbance_list).astype(float)
-    time = [float(i) for i in time_vec]
-    acq_time = max(time) / len(time)
-    # generates new time column
-    time_series = pd.Series(range(1, (len(time) + 1))).astype(float) * acq_time
-
-    wavelength_vec = lines[wl_idx].split("\t")[1:]
-    wavelength = [float(i) for i in wavelength_vec]
-
-    df = pd.DataFrame(absorbance, columns=wavelength)
-    df = df.assign(time=pd.Series(time_series).values)
-
-    df = pd.melt(df, id_vars='time', value_vars=df.columns,
-                 var_name='wavelength', value_name='absorbance')
-    return df
-
-
-def read_empower(path, wl_high_pass=None, wl_low_pass=None):
+        wavelength_line = None
+        for line in file:
+            if wavelength_line is None and line.startswith('Wavelength'):
+                wavelength_line = line
+            elif line.startswith('Time'):
+                break
+        else:
+            raise ValueError(f"No time header found in Empower file {path}.")
+        file.readline()  # unit line
+        wavelength = np.array(wavelength_line.rstrip().split('\t')[1:],
+                              dtype=float)
+        wl_idx = get_filter_index(wavelength, wl_high_pass, wl_low_pass)
+        # trailing tabs would give additional empty columns
+        block = pd.read_csv(file, sep='\t', header=None, dtype=float,
+                            usecols=[0] + list(wl_idx + 1), engine='c').values
+
+    data = np.ascontiguousarray(block[:, 1:].T)
+    time = get_time_vector(block[:, 0])
+    return data, time, wavelength[wl_idx]
+
+
+def read_empower(path, wl_high_pass=None, wl_low_pass=None, dtype=None):
     """
-    Labsolutions read and processing function.
+    Empower read and processing function.
     """
-    df = read_arw_empower(path)
-    df = apply_filter(df, wl_high_pass, wl_low_pass)
-    data, time, wavelength = df_to_array(df)
+    data, time, wavelength = read_arw_empower(path, wl_high_pass, wl_low_pass)
+    data, wavelength = apply_array_filter(data, wavelength, wl_high_pass,
+                                          wl_low_pass, dtype=dtype)
     return data, time, wavelength
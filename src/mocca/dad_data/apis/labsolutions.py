@@ -6,68 +6,71 @@ Created on Mon Aug 30 15:17:53 2021
 
 @author: haascp
 """
+import numpy as np
 import pandas as pd
 
-from mocca.dad_data.utils import df_to_array, apply_filter
+from mocca.dad_data.utils import (get_time_vector, apply_array_filter,
+                                  get_filter_index)
 
 
-def read_txt_shimadzu(path):
+def read_txt_shimadzu(path, wl_high_pass=None, wl_low_pass=None):
     """
-    Reads the 3D data exported by the LabSolutions software. 
+    Reads the 3D data exported by the LabSolutions software. The file is
+    streamed line by line until the header of the [PDA 3D] section is reached
+    and the numeric block is parsed in one go by the pandas C parser.
+
     Parameters
     ----------
     path : str
         The directory, in which the experimental data are stored.
+    wl_high_pass : float, optional
+        Only wavelength columns required to filter the data to wavelengths
+        above this value are parsed.
+    wl_low_pass : float, optional
+        Only wavelength columns required to filter the data to wavelengths
+        below this value are parsed.
 
     Returns
     -------
-    df : pandas.DataFrame
-        First column is time, the following columns obtain the absorbance 
-        values at the given detection wavelength in the column name.
+    data : numpy.ndarray
+        Absorbance values with the shape [# of wavelengths] x [timepoints].
+    time : numpy.ndarray
+        Time vector.
+    wavelength : numpy.ndarray
+        Wavelength vector.
     """
     with open(path) as file:
-        lines = file.readlines()
-        lines = [line.rstrip() for line in lines]
-
-    #cut text file to the relevant data 
-    pda_line = 0
-    while "[PDA 3D]" not in lines[pda_line]:
-        pda_line += 1
-
-    start_line = pda_line
-    while len(lines[start_line]) < 100:
-        start_line += 1
-    data = lines[start_line:]
+        #seek to the header line of the [PDA 3D] section
+        in_pda_section = False
+        for line in file:
+            if "[PDA 3D]" in line:
+                in_pda_section = True
+            if in_pda_section and len(line.rstrip()) >= 100:
+                break
+        else:
+            raise ValueError(f"No [PDA 3D] data found in LabSolutions file {path}.")
+        columns = line.rstrip().split(',')
+        wavelength = np.array(columns[1:], dtype=float) / 100
+        wl_idx = get_filter_index(wavelength, wl_high_pass, wl_low_pass)
+        df = pd.read_csv(file, header=None, names=range(len(columns)),
+                         usecols=[0] + list(wl_idx + 1), engine='c')
 
-    #split data using comma as separator
-    data = [line.split(',') for line in data]
-    
-    #create dataframe and tidy data
-    df = pd.DataFrame(data).dropna()
-    #first line as column names
-    df.columns = df.iloc[0]
-    df = df.drop(df.index[0]).reset_index(drop=True)
-    #first column time
-    df.rename(columns={df.columns[0]: 'time'}, inplace=True) # names time column
-    df = df.astype('float')
-    #set time vector
-    acq_time = df.time.max() / len(df)
-    time_series = pd.Series(range(1, (len(df) + 1))).astype(float) * acq_time # generates new time column
-    df['time'] = time_series
-    #tidy data
-    df = pd.melt(df, id_vars='time', value_vars=df.columns[1:], 
-                 var_name='wavelength', value_name='absorbance')
-    df['wavelength'] = df['wavelength'].astype(float)
-    df['wavelength'] = df['wavelength'] / 100
-    df['absorbance'] = df['absorbance'] / 1000
-    return df
+    #lines of following sections are not numeric or have less fields
+    if not all(pd.api.types.is_float_dtype(dtype) or
+               pd.api.types.is_integer_dtype(dtype) for dtype in df.dtypes):
+        df = df.apply(pd.to_numeric, errors='coerce')
+    df = df.dropna()
+    data = np.ascontiguousarray(df.iloc[:, 1:].to_numpy(dtype=float).T)
+    data /= 1000
+    time = get_time_vector(df.iloc[:, 0].to_numpy(dtype=float))
+    return data, time, wavelength[wl_idx]
 
 
-def read_labsolutions(path, wl_high_pass=None, wl_low_pass=None):
+def read_labsolutions(path, wl_high_pass=None, wl_low_pass=None, dtype=None):
     """
     Labsolutions read and processing function.
     """
-    df = read_txt_shimadzu(path)
-    df = apply_filter(df, wl_high_pass, wl_low_pass)
-    data, time, wavelength = df_to_array(df)
-    return data, time, wavelength
\ No newline at end of file
+    data, time, wavelength = read_txt_shimadzu(path, wl_high_pass, wl_low_pass)
+    data, wavelength = apply_array_filter(data, wavelength, wl_high_pass,
+                                          wl_low_pass, dtype=dtype)
+    return data, time, wavelength
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:21:09 2026
+
+@author: haascp
+
+Registry of the readers for the data formats of the supported HPLC systems.
+Readers of other packages are registered via the package entry point group
+mocca.readers, e.g., in the setup.cfg of the package:
+
+[options.entry_points]
+mocca.readers =
+    my_hplc = my_package.reader:read_my_hplc
+
+The entry point either refers to a reader function or to a DadReader object
+which additionally declares the capabilities of the reader.
+"""
+
+import sys
+import importlib
+from dataclasses import dataclass
+
+if sys.version_info[:2] >= (3, 8):
+    from importlib.metadata import entry_points  # pragma: no cover
+else:
+    from importlib_metadata import entry_points  # pragma: no cover
+
+ENTRY_POINT_GROUP = 'mocca.readers'
+
+
+@dataclass(frozen=True)
+class DadReader():
+    """
+    Reader of the data format of an HPLC system. The reader function is given
+    by its import path (module:function) and only imported when data are read,
+    so that dependencies of unused readers are never imported.
+
+    The reader function is called with the path of the data, wl_high_pass,
+    wl_low_pass and dtype (or with the experiment and dtype if the reader does
+    not read files) and returns the filtered absorbance data with the shape
+    [# of wavelengths] x [timepoints], the time vector and the wavelength
+    vector. Readers of files have to return freshly allocated data arrays,
+    which are modified in place during baseline correction.
+    """
+    hplc_system_tag : str
+    read_func : str
+    detector_limit : float = float("inf")
+    reads_file : bool = True  # False if data are given with the experiment
+    wl_filter : bool = True  # False if wavelengths cannot be filtered
+
+    def load(self):
+        """
+        Imports and returns the reader function.
+        """
+        module_name, func_name = self.read_func.split(':')
+        return getattr(importlib.import_module(module_name), func_name)
+
+    def read(self, experiment, wl_high_pass=None, wl_low_pass=None,
+             dtype=None):
+        """
+        Reads the data of the given experiment.
+        """
+        read_func = self.load()
+        if self.reads_file:
+            return read_func(experiment.path, wl_high_pass, wl_low_pass, dtype)
+        return read_func(experiment, dtype)
+
+
+READERS = {}
+
+
+def register_reader(reader, overwrite=False):
+    """
+    Registers the given reader under its HPLC system tag.
+    """
+    if reader.hplc_system_tag in READERS and not overwrite:
+        raise ValueError(f"Reader for hplc_system_tag "
+                         f"{reader.hplc_system_tag} is already registered.")
+    READERS[reader.hplc_system_tag] = reader
+
+
+def load_entry_point_reader(hplc_system_tag):
+    """
+    Registers and returns the reader of the given HPLC system tag provided by
+    an installed package via the mocca.readers entry point group. Returns None
+    if no package provides a reader for this tag.
+    """
+    eps = entry_points()
+    if hasattr(eps, 'select'):
+        eps = eps.select(group=ENTRY_POINT_GROUP)
+    else:
+        eps = eps.get(ENTRY_POINT_GROUP, [])
+    for ep in eps:
+        if ep.name == hplc_system_tag:
+            obj = ep.load()
+            if isinstance(obj, DadReader):
+                reader = obj
+            else:
+                reader = DadReader(hplc_system_tag, f"{obj.__module__}:"
+                                   f"{obj.__name__}")
+            register_reader(reader, overwrite=True)
+            return reader
+    return None
+
+
+def get_reader(hplc_system_tag):
+    """
+    Returns the reader registered for the given HPLC system tag.
+    """
+    reader = READERS.get(hplc_system_tag)
+    if reader is None:
+        reader = load_entry_point_reader(hplc_system_tag)
+    if reader is None:
+        raise ValueError(f"Given hplc_system_tag {hplc_system_tag} is not "
+                         "defined in MOCCA.")
+    return reader
+
+
+for reader in [
+    DadReader('chemstation', 'mocca.dad_data.apis.chemstation:read_chemstation'),
+    DadReader('chemstation_uv',
+              'mocca.dad_data.apis.chemstation_uv:read_chemstation_uv'),
+    DadReader('angi', 'mocca.dad_data.apis.angi:read_angi'),
+    DadReader('labsolutions',
+              'mocca.dad_data.apis.labsolutions:read_labsolutions'),
+    DadReader('empower', 'mocca.dad_data.apis.empower:read_empower'),
+    DadReader('allotrope', 'mocca.dad_data.apis.allotrope:read_adf'),
+    DadReader('custom', 'mocca.dad_data.apis.custom:read_custom_data',
+              reads_file=False, wl_filter=False)
+]:
+    register_reader(reader)
+del reader
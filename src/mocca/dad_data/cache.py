@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 12:04:31 2026
+
+@author: haascp
+"""
+import os
+import hashlib
+import shutil
+import tempfile
+
+import numpy as np
+
+# increase if the content of cached arrays changes for the same cache key
+CACHE_VERSION = 1
+# prefix of the files of lazily stored arrays
+LAZY_FILE_PREFIX = 'mocca_lazy_'
+
+
+def get_content_hash(path, chunk_size=2**20):
+    """
+    Returns the SHA-256 hash of the content of the given file. If the path is a
+    directory (e.g., ChemStation .D folders), all files in the directory tree
+    are hashed together with their relative paths.
+    """
+    hasher = hashlib.sha256()
+    if os.path.isdir(path):
+        file_paths = []
+        for dir_path, dir_names, file_names in os.walk(path):
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                file_paths.append(os.path.join(dir_path, file_name))
+    else:
+        file_paths = [path]
+    for file_path in file_paths:
+        hasher.update(os.path.relpath(file_path, path).encode())
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def get_file_stamp(path):
+    """
+    Returns a cheap fingerprint of the given file (or of all files in the given
+    directory) consisting of the absolute path, size and modification time.
+    """
+    path = os.path.abspath(path)
+    if os.path.isdir(path):
+        file_paths = sorted(os.path.join(dir_path, file_name) for
+                            dir_path, _, file_names in os.walk(path) for
+                            file_name in file_names)
+    else:
+        file_paths = [path]
+    stamp = [path]
+    for file_path in file_paths:
+        stat = os.stat(file_path)
+        stamp.append((os.path.relpath(file_path, path), stat.st_size,
+                      stat.st_mtime_ns))
+    return tuple(stamp)
+
+
+def get_cache_key(*parts):
+    """
+    Returns a cache key built from the representation of the given parts.
+    """
+    return hashlib.sha256(repr((CACHE_VERSION,) + parts).encode()).hexdigest()
+
+
+def load_cached_arrays(cache_dir, namespace, key, names, mmap_mode='r'):
+    """
+    Loads the arrays with the given names stored under the key. The arrays are
+    memory-mapped by default. Returns None if no complete cache entry exists.
+    Memory-mapped arrays are returned as plain ndarray views so that they can be
+    pickled like any other array when the campaign is saved.
+    """
+    entry_dir = os.path.join(cache_dir, namespace, key)
+    paths = [os.path.join(entry_dir, f"{name}.npy") for name in names]
+    if not all(os.path.exists(path) for path in paths):
+        return None
+    try:
+        return {name: np.load(path, mmap_mode=mmap_mode).view(np.ndarray)
+                for name, path in zip(names, paths)}
+    except (OSError, ValueError):
+        # corrupt or incompatible entry, treat as cache miss
+        return None
+
+
+def save_cached_arrays(cache_dir, namespace, key, arrays):
+    """
+    Stores the given dict of arrays as .npy files under the key. The entry is
+    written to a temporary directory first and then moved into place so that
+    concurrent or interrupted writes never leave incomplete entries.
+    """
+    namespace_dir = os.path.join(cache_dir, namespace)
+    os.makedirs(namespace_dir, exist_ok=True)
+    entry_dir = os.path.join(namespace_dir, key)
+    tmp_dir = tempfile.mkdtemp(prefix=f".{key}-", dir=namespace_dir)
+    try:
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.asarray(array))
+        os.replace(tmp_dir, entry_dir)
+    except OSError:
+        # entry was created in the meantime by another process
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def is_memory_mapped(array):
+    """
+    Checks if the given array is backed by a memory-mapped file.
+    """
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, 'base', None)
+    return False
+
+
+def clean_lazy_dir(lazy_dir):
+    """
+    Removes the files of lazily stored arrays left in the lazy directory on
+    systems which cannot unlink mapped files (see store_array_lazily). Files
+    of arrays which are still in use cannot be removed and are skipped.
+    """
+    if not os.path.isdir(lazy_dir):
+        return
+    for file_name in os.listdir(lazy_dir):
+        if file_name.startswith(LAZY_FILE_PREFIX) and file_name.endswith('.npy'):
+            try:
+                os.remove(os.path.join(lazy_dir, file_name))
+            except OSError:
+                pass
+
+
+def store_array_lazily(array, lazy_dir):
+    """
+    Writes the array to a .npy file in the given directory and returns a
+    read-only memory-mapped view of it. Only the accessed parts of the returned
+    array are paged into memory and the operating system can drop them again
+    under memory pressure. On POSIX systems, the file is unlinked right after
+    mapping so that it is removed as soon as the array is garbage-collected.
+    Other systems do not allow to remove mapped files, so the files are
+    removed later by clean_lazy_dir.
+    """
+    if is_memory_mapped(array):
+        return array
+    os.makedirs(lazy_dir, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix=LAZY_FILE_PREFIX, suffix='.npy',
+                                dir=lazy_dir)
+    with os.fdopen(fd, 'wb') as f:
+        np.save(f, array)
+    lazy_array = np.load(path, mmap_mode='r').view(np.ndarray)
+    if os.name == 'posix':
+        os.remove(path)
+    return lazy_array
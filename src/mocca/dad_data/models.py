@@ -7,24 +7,97 @@ Created on Tue Aug  3 13:16:51 2021
 """
 
 from dataclasses import dataclass, field, InitVar
+from types import SimpleNamespace
 from typing import List
 import numpy as np
-import copy
 
-from mocca.dad_data.utils import trim_data
+from mocca.dad_data.utils import trim_data, sum_absorbance_by_time
+from mocca.dad_data.cache import (get_content_hash, get_file_stamp,
+                                  get_cache_key, load_cached_arrays,
+                                  save_cached_arrays, store_array_lazily,
+                                  is_memory_mapped)
 from mocca.dad_data.process_gradientdata import bsl_als
-from mocca.dad_data.apis.chemstation import read_chemstation
-from mocca.dad_data.apis.labsolutions import read_labsolutions
-from mocca.dad_data.apis.empower import read_empower
-from mocca.dad_data.apis.allotrope import read_adf
-from mocca.dad_data.apis.custom import read_custom_data
-from mocca.dad_data.apis.angi import read_angi
+from mocca.dad_data.resample import get_time_step, resample_data, bin_data
+from mocca.dad_data.apis.registry import get_reader
 
 import mocca.peak.models
 
 
+class DerivedTraces():
+    """
+    Mixin for DAD data containers which computes traces and statistics derived
+    from the absorbance data only once when they are first needed. The cached
+    values are dropped when the data attribute is set. If the data are modified in
+    place, invalidate_cache has to be called.
+    """
+    def __setattr__(self, name, value):
+        if name == 'data':
+            self.invalidate_cache()
+        super().__setattr__(name, value)
+
+    def invalidate_cache(self):
+        """
+        Drops all cached derived traces.
+        """
+        self.__dict__.pop('_derived_traces', None)
+
+    def _get_derived_trace(self, key, func):
+        """
+        Returns the cached trace of the given key and computes it with func if
+        it is not cached yet. Cached traces are read-only.
+        """
+        derived_traces = self.__dict__.setdefault('_derived_traces', {})
+        if key not in derived_traces:
+            trace = func()
+            if isinstance(trace, np.ndarray):
+                trace.setflags(write=False)
+            derived_traces[key] = trace
+        return derived_traces[key]
+
+    def get_summed_trace(self):
+        """
+        Returns the absorbance summed over all wavelengths for each time point.
+        """
+        return self._get_derived_trace(
+            'summed', lambda: sum_absorbance_by_time(self.data))
+
+    def get_smoothed_trace(self, window=5):
+        """
+        Returns the summed absorbance smoothed by a moving average with the
+        given window length on the time axis.
+        """
+        return self._get_derived_trace(
+            ('smoothed', window), lambda: np.convolve(self.get_summed_trace(),
+                                                      np.ones(window),
+                                                      'same') / window)
+
+    def get_max_absorbance(self):
+        """
+        Returns the maximum absorbance of the dataset.
+        """
+        return self._get_derived_trace('max', lambda: np.max(self.data))
+
+    def get_noise_mask(self):
+        """
+        Returns a boolean mask of all time points at which the absorbance at
+        all wavelengths is below 1% of the maximum absorbance.
+        """
+        return self._get_derived_trace(
+            'noise_mask', lambda: (np.max(self.data, axis=0) <
+                                   0.01 * self.get_max_absorbance()))
+
+    def get_noise_variance(self):
+        """
+        Returns the variance over all wavelengths averaged over the time points
+        of the noise mask.
+        """
+        return self._get_derived_trace(
+            'noise_variance', lambda: np.mean(np.var(
+                self.data[:, self.get_noise_mask()], axis=0)))
+
+
 @dataclass()
-class DadData():
+class DadData(DerivedTraces):
     """
     Base class for HPLC-DAD data.
     """
@@ -32,6 +105,10 @@ class DadData():
     experiment : InitVar["mocca.user_interaction.user_objects.HplcInput"]
     wl_high_pass : InitVar[float] = None
     wl_low_pass : InitVar[float] = None
+    raw_cache_dir : InitVar[str] = None
+    lazy_dir : InitVar[str] = None
+    dtype : InitVar[str] = None
+    resample_params : InitVar[dict] = None
 
     # set during initialization
     path : str = field(init=False)
@@ -40,13 +117,22 @@ class DadData():
     wavelength : np.ndarray = field(init=False)
     warnings : List[str] = field(init=False)
 
-    def __post_init__(self, experiment, wl_high_pass, wl_low_pass):
+    def __post_init__(self, experiment, wl_high_pass, wl_low_pass,
+                      raw_cache_dir, lazy_dir, dtype, resample_params):
         """
-        Process init variables to set attributes.
+        Process init variables to set attributes. If a lazy directory is given,
+        subclasses move their final data arrays to memory-mapped files in this
+        directory. The absorbance data are stored in the given floating point
+        dtype (default: float64). If resample_params are given, the data are
+        resampled on a common time grid and binned in time (see
+        _resample_data).
         """
         self.warnings = []
         self._set_path(experiment)
-        self._read_data(wl_high_pass, wl_low_pass, experiment)
+        self._read_data(wl_high_pass, wl_low_pass, experiment, raw_cache_dir,
+                        dtype)
+        self.data, self.time = self._resample_data(self.data, self.time,
+                                                   experiment, resample_params)
         experiment.processed = True
 
     def __eq__(self, other):
@@ -60,40 +146,98 @@ class DadData():
                 (self.data.__array_interface__['data'] ==
                  other.data.__array_interface__['data']))
 
+    def _store_lazily(self, lazy_dir, attributes=('data',)):
+        """
+        Replaces the given array attributes by memory-mapped arrays stored in
+        the lazy directory so that data are only paged in when accessed, e.g.,
+        when peak data are sliced out of the dataset.
+        """
+        for attribute in attributes:
+            setattr(self, attribute,
+                    store_array_lazily(getattr(self, attribute), lazy_dir))
+
     def _set_path(self, experiment):
         """
         Sets path to the data file.
         """
         self.path = experiment.path
 
-    def _read_data(self, wl_high_pass, wl_low_pass, experiment):
-        """
-        Read the data file, preprocess it and filter it in order to obtain
-        standardized data format for all HPLC systems.
-        """
-        if self.hplc_system_tag == 'chemstation':
-            data, time, wavelength = read_chemstation(self.path, wl_high_pass,
-                                                      wl_low_pass)
-        elif self.hplc_system_tag == 'angi':
-            data, time, wavelength = read_angi(self.path, wl_high_pass,
-                                               wl_low_pass)
-        elif self.hplc_system_tag == 'labsolutions':
-            data, time, wavelength = read_labsolutions(self.path, wl_high_pass,
-                                                       wl_low_pass)
-        elif self.hplc_system_tag == 'empower':
-            data, time, wavelength = read_empower(self.path, wl_high_pass,
-                                                  wl_low_pass)
-        elif self.hplc_system_tag == 'allotrope':
-            data, time, wavelength = read_adf(self.path, wl_high_pass,
-                                              wl_low_pass)
-        elif self.hplc_system_tag == 'custom':
-            data, time, wavelength = read_custom_data(experiment)
-        else:
-            raise ValueError(f"Given hplc_system_tag  {self.hplc_system_tag} is "
-                             "not defined in MOCCA.")
-        self.data = data
-        self.time = time
-        self.wavelength = wavelength
+    def _read_data(self, wl_high_pass, wl_low_pass, experiment,
+                   raw_cache_dir=None, dtype=None):
+        """
+        Read the data file with the reader registered for the HPLC system,
+        preprocess it and filter it in order to obtain standardized data format
+        for all HPLC systems (see _load_data).
+        """
+        self.data, self.time, self.wavelength = self._load_data(
+            wl_high_pass, wl_low_pass, experiment, raw_cache_dir, dtype)
+
+    def _resample_data(self, data, time, experiment, resample_params):
+        """
+        Resamples the data with the method given in the resample_params on the
+        time grid with the time step given in the resample_params. If no time
+        step is given, the time grid of the gradient of the experiment is used,
+        which has to be processed with the same resample_params (see
+        _get_resample_time_step). Afterwards, the data are binned in time if a
+        bin factor is given. Returns the data unchanged if resampling is not
+        enabled.
+        """
+        if not resample_params:
+            return data, time
+        bin_factor = resample_params.get('bin_factor', 1)
+        if resample_params.get('method'):
+            time_step = self._get_resample_time_step(experiment,
+                                                     resample_params)
+            if time_step is not None:
+                data, time = resample_data(data, time, time_step,
+                                           resample_params['method'])
+        return bin_data(data, time, bin_factor,
+                        resample_params.get('binning', 'mean'))
+
+    def _get_resample_time_step(self, experiment, resample_params):
+        """
+        Returns the time step given in the resample_params or, if not given,
+        the time step of the gradient of the experiment before binning. Raises
+        a ValueError if no time step can be determined.
+        """
+        time_step = resample_params.get('time_step')
+        if time_step is not None:
+            return time_step
+        gradient = getattr(experiment, 'gradient', None)
+        if getattr(gradient, 'dataset', None) is None:
+            raise ValueError("Time resampling requires a time step if the "
+                             f"data of {experiment.path} are not aligned to "
+                             "a gradient.")
+        # the gradient time grid is already binned
+        return (get_time_step(gradient.dataset.time) /
+                resample_params.get('bin_factor', 1))
+
+    def _load_data(self, wl_high_pass, wl_low_pass, experiment,
+                   raw_cache_dir=None, dtype=None):
+        """
+        Returns the data, time and wavelength arrays read by the reader
+        registered for the HPLC system. If a raw cache directory is given, the
+        parsed data are stored there and memory-mapped instead of parsing the
+        file again as long as the file is unchanged.
+        """
+        reader = get_reader(self.hplc_system_tag)
+        use_cache = raw_cache_dir and reader.reads_file
+        if use_cache:
+            cache_key = get_cache_key(get_file_stamp(self.path),
+                                      self.hplc_system_tag, wl_high_pass,
+                                      wl_low_pass, np.dtype(dtype).str)
+            arrays = load_cached_arrays(raw_cache_dir, 'raw', cache_key,
+                                        ['data', 'time', 'wavelength'])
+            if arrays is not None:
+                return arrays['data'], arrays['time'], arrays['wavelength']
+
+        data, time, wavelength = reader.read(experiment, wl_high_pass,
+                                             wl_low_pass, dtype)
+        if use_cache:
+            save_cached_arrays(raw_cache_dir, 'raw', cache_key,
+                               {'data': data, 'time': time,
+                                'wavelength': wavelength})
+        return data, time, wavelength
 
 
 @dataclass(eq=False)
@@ -101,15 +245,123 @@ class GradientData(DadData):
     """
     Data container for gradient HPLC-DAD data.
     """
+    baseline_params : InitVar[dict] = None
+    cache_dir : InitVar[str] = None
+    compact : InitVar[bool] = False
     original_data : np.ndarray = field(init=False)
+    read_params : dict = field(init=False, repr=False)
 
-    def __post_init__(self, experiment, wl_high_pass, wl_low_pass):
+    def __post_init__(self, experiment, wl_high_pass, wl_low_pass,
+                      raw_cache_dir, lazy_dir, dtype, resample_params,
+                      baseline_params, cache_dir, compact):
         """
-        Process and baseline-correct given data.
+        Process and baseline-correct given data. The baseline_params are passed
+        as keyword arguments to the baseline algorithm. If a cache directory is
+        given, processed gradients are stored there and reused if the same
+        gradient file is processed again with the same parameters. In compact
+        mode, only the baseline is kept and the original data are read again
+        when needed (see get_original_data).
         """
-        super().__post_init__(experiment, wl_high_pass, wl_low_pass)
-        self.original_data = copy.deepcopy(self.data)
-        self.data = bsl_als(self.data)
+        baseline_params = baseline_params or {}
+        cache_key = None
+        if cache_dir:
+            cache_key = self._get_cache_key(experiment, wl_high_pass,
+                                            wl_low_pass, dtype, resample_params,
+                                            baseline_params)
+        # only plain parameters, so that the experiment is not kept alive
+        self.read_params = {'wl_high_pass': wl_high_pass,
+                            'wl_low_pass': wl_low_pass,
+                            'raw_cache_dir': raw_cache_dir,
+                            'dtype': dtype,
+                            'resample_params': resample_params,
+                            'cache_dir': cache_dir,
+                            'cache_key': cache_key}
+        if cache_dir:
+            if self._load_cache(experiment, cache_dir, cache_key, compact):
+                return
+        super().__post_init__(experiment, wl_high_pass, wl_low_pass,
+                              raw_cache_dir, lazy_dir, dtype, resample_params)
+        # the baseline is a new array, so the original data need no copy
+        original_data = self.data
+        self.data = bsl_als(original_data, **baseline_params).astype(
+            original_data.dtype, copy=False)
+        if cache_dir:
+            save_cached_arrays(cache_dir, 'gradients', cache_key,
+                               {'original_data': original_data,
+                                'data': self.data,
+                                'time': self.time,
+                                'wavelength': self.wavelength})
+        self.original_data = None if compact else original_data
+        if lazy_dir:
+            self._store_lazily(lazy_dir, ('data',) if compact else
+                               ('data', 'original_data'))
+
+    def get_original_data(self):
+        """
+        Returns the gradient data before baseline correction. In compact mode,
+        the original data are loaded from the gradient cache if available and
+        read again from the data file otherwise.
+        """
+        if self.original_data is not None:
+            return self.original_data
+        params = self.read_params
+        if params['cache_dir']:
+            arrays = load_cached_arrays(params['cache_dir'], 'gradients',
+                                        params['cache_key'], ['original_data'])
+            if arrays is not None:
+                return arrays['original_data']
+        # gradients are always read from data files
+        experiment = SimpleNamespace(path=self.path, gradient=None,
+                                     custom_data=None)
+        data, time, _ = self._load_data(params['wl_high_pass'],
+                                        params['wl_low_pass'], experiment,
+                                        params['raw_cache_dir'],
+                                        params['dtype'])
+        data, _ = self._resample_data(data, time, experiment,
+                                      params['resample_params'])
+        return data
+
+    def _get_resample_time_step(self, experiment, resample_params):
+        """
+        Returns the time step given in the resample_params. Without a given
+        time step, the gradient keeps its time grid to which the runs are
+        aligned.
+        """
+        return resample_params.get('time_step')
+
+    def _get_cache_key(self, experiment, wl_high_pass, wl_low_pass, dtype,
+                       resample_params, baseline_params):
+        """
+        Returns the cache key of the processed gradient, which is built from the
+        content of the gradient file and all parameters affecting the result.
+        """
+        # parallelization parameters do not change the resulting baseline
+        result_params = sorted((key, val) for key, val in baseline_params.items()
+                               if key not in ('n_jobs', 'use_processes'))
+        return get_cache_key(get_content_hash(experiment.path),
+                             self.hplc_system_tag, wl_high_pass, wl_low_pass,
+                             np.dtype(dtype).str,
+                             sorted((resample_params or {}).items()),
+                             result_params)
+
+    def _load_cache(self, experiment, cache_dir, cache_key, compact=False):
+        """
+        Sets the attributes from memory-mapped cached arrays. Returns False if
+        the gradient is not in the cache.
+        """
+        names = ['data', 'time', 'wavelength']
+        if not compact:
+            names.append('original_data')
+        arrays = load_cached_arrays(cache_dir, 'gradients', cache_key, names)
+        if arrays is None:
+            return False
+        self.original_data = None
+        self.warnings = []
+        self._set_path(experiment)
+        for name, array in arrays.items():
+            setattr(self, name, array)
+        experiment.processed = True
+        return True
 
 
 @dataclass(eq=False)
@@ -117,26 +369,76 @@ class CompoundData(DadData):
     """
     Data container for HPLC-DAD data with peaks originating from compounds.
     """
-    def __post_init__(self, experiment, wl_high_pass, wl_low_pass):
+    def __post_init__(self, experiment, wl_high_pass, wl_low_pass,
+                      raw_cache_dir, lazy_dir, dtype, resample_params):
         """
         Baseline-corrects the given HPLC-DAD data.
         """
-        super().__post_init__(experiment, wl_high_pass, wl_low_pass)
+        super().__post_init__(experiment, wl_high_pass, wl_low_pass,
+                              raw_cache_dir, lazy_dir, dtype, resample_params)
         if experiment.gradient is not None:
-            self._subtract_baseline(experiment.gradient.dataset)
+            self._subtract_baseline(experiment.gradient.dataset,
+                                    self._is_writable_data(experiment))
+            self._check_consumed_custom_data(experiment)
+        if lazy_dir:
+            self._store_lazily(lazy_dir)
 
     def _trim_data(self, length):
         """Trims the data in the time dimension to the length provided"""
         self.data, self.time = trim_data(data=self.data, time=self.time, length=length)
 
-    def _subtract_baseline(self, gradient):
-        """Subtracts the baseline of the gradient numpy array from self.data."""
+    def _is_writable_data(self, experiment):
+        """
+        Checks if self.data may be modified in place. Data read from files are
+        freshly allocated by the reader and can be overwritten, but not if they
+        are memory-mapped from the raw cache or if they are trimmed to a shorter
+        gradient, since the trimmed view would keep the full buffer alive.
+        Custom data are only modified in place if permitted or if they were
+        already copied, e.g., by a dtype conversion.
+        """
+        custom_data = experiment.custom_data
+        if custom_data is None:
+            n_gradient_times = experiment.gradient.dataset.data.shape[1]
+            return (self.data.flags.writeable and
+                    not is_memory_mapped(self.data) and
+                    self.data.shape[1] <= n_gradient_times)
+        return (custom_data.in_place or
+                not np.may_share_memory(self.data, custom_data.data))
+
+    def _check_consumed_custom_data(self, experiment):
+        """
+        Marks custom data as consumed if they were modified in place, so that
+        they are not baseline-corrected twice if processed again.
+        """
+        custom_data = experiment.custom_data
+        if custom_data is not None and np.may_share_memory(self.data,
+                                                           custom_data.data):
+            custom_data.consumed = True
+
+    def _subtract_baseline(self, gradient, in_place=False):
+        """
+        Subtracts the baseline of the gradient numpy array from self.data. If
+        in_place is True, self.data is overwritten instead of allocating a new
+        array, as long as the baseline can be cast to its dtype.
+        """
         self._trim_data(gradient.data.shape[1])
-        self.data = self.data - gradient.data[:, :self.data.shape[1]]
+        # view of the shared gradient aligned to the (trimmed) run
+        baseline = gradient.data
+        if baseline.shape[1] != self.data.shape[1]:
+            baseline = baseline[:, :self.data.shape[1]]
+        if (in_place and self.data.flags.writeable and
+                np.can_cast(baseline.dtype, self.data.dtype, 'same_kind')):
+            np.subtract(self.data, baseline, out=self.data)
+            self.invalidate_cache()
+        else:
+            # keep the floating point precision of the run data
+            self.data = np.subtract(self.data, baseline,
+                                    dtype=np.result_type(self.data.dtype,
+                                                         np.float32))
 
 
 @dataclass
-class ParafacData():
+class ParafacData(DerivedTraces):
     """
     Data container for synthetic data generated from PARAFAC models.
     """
@@ -158,7 +460,8 @@ class ParafacData():
         self.path = impure_peak.dataset.path
         self.time = impure_peak.dataset.time
         self.wavelength = impure_peak.dataset.wavelength
-        self.data = np.zeros((len(self.wavelength), len(self.time)))
+        self.data = np.zeros((len(self.wavelength), len(self.time)),
+                             dtype=impure_peak.dataset.data.dtype)
         self._make_data_from_parafac_peak(impure_peak, parafac_comp_tensor,
                                           boundaries, shift, y_offset)
 
@@ -184,6 +487,7 @@ class ParafacData():
 
         self.data[:, left:right] = parafac_peak_data + y_offset
         self.data[self.data < 0] = 0
+        self.invalidate_cache()
 
     def __eq__(self, other):
         """
@@ -3,9 +3,6 @@ from scipy.signal import find_peaks, peak_widths
 
 from mocca.peak.models import BasePeak, PickedPeak
 from mocca.chromatogram.model import Chromatogram
-from mocca.chromatogram.utils import check_overlap
-
-from mocca.dad_data.utils import sum_absorbance_by_time
 
 
 def get_peak_locs(summed_data):
@@ -38,7 +35,9 @@ def get_peak_locs(summed_data):
 
 def merge_peaks(summed_data, peaks):
     """
-    Merges overlapping peaks in the data.
+    Merges overlapping peaks in the data. The peaks are sorted by their left
+    borders and swept once, so that chains of overlapping peaks are merged into
+    one peak in O(n log n).
 
     Parameters
     ----------
@@ -53,40 +52,25 @@ def merge_peaks(summed_data, peaks):
     Returns
     -------
     new_peaks : list
-        List of all peaks in dictionary format with keys maximum, left, and right.
-        Peaks that overlap are merged together into one BasePeak.
+        List of all peaks as BasePeak objects sorted by their maxima.
+        Peaks that overlap are merged together into one BasePeak with the
+        maximum of the highest peak.
     """
-
-    new_peaks = set()
-    for cur_peak in peaks:
-        overlapping_peaks = []
-        for other in peaks:
-            if check_overlap(cur_peak, other):
-                overlapping_peaks.append(other)
-
-        merged_peak = [-1, np.inf, 0]
-        for peak in overlapping_peaks:  # otherwise, merge peaks
-            merged_peak[0] = (peak.maximum if summed_data[peak.maximum] >
-                              summed_data[merged_peak[0]] or merged_peak[0] == -1
-                              else merged_peak[0])
-            merged_peak[1] = min(merged_peak[1], peak.left)
+    merged_peaks = []  # lists [maximum, left, right]
+    for peak in sorted(peaks, key=lambda peak: (peak.left, peak.maximum)):
+        # overlap as defined in check_overlap, ie, borders may touch
+        if merged_peaks and peak.left <= merged_peaks[-1][2]:
+            merged_peak = merged_peaks[-1]
+            # the earlier maximum is kept if both maxima are equally high
+            if (summed_data[peak.maximum], -peak.maximum) > \
+                    (summed_data[merged_peak[0]], -merged_peak[0]):
+                merged_peak[0] = peak.maximum
             merged_peak[2] = max(merged_peak[2], peak.right)
-        new_peaks.add(tuple(merged_peak))
+        else:
+            merged_peaks.append([peak.maximum, peak.left, peak.right])
 
-    new_peaks = sorted(new_peaks, key=lambda x: x[0])
-    peak_list = [BasePeak(maximum=maximum, left=left, right=right, offset=0)
-                 for maximum, left, right in new_peaks]
-
-    # if merge does nothing, then return
-    if peak_list == peaks:
-        return peak_list
-    # else, if the merging results in fewer peaks, recurse
-    # recursion takes care of some special cases of overlapping peaks
-    # and merges the previous list if necessary
-    elif len(merge_peaks(summed_data, peak_list)) < len(peak_list):
-        return merge_peaks(summed_data, peak_list)
-    # otherwise, just return fully merged list
-    return peak_list
+    return [BasePeak(maximum=maximum, left=left, right=right, offset=0)
+            for maximum, left, right in sorted(merged_peaks)]
 
 
 def pick_peaks(compound_data, experiment, absorbance_threshold,
@@ -123,7 +107,7 @@ def pick_peaks(compound_data, experiment, absorbance_threshold,
     peaks : list
         List of all peaks, as a list of tuples (maximum, left, right)
     """
-    summed_data = sum_absorbance_by_time(compound_data.data)
+    summed_data = compound_data.get_summed_trace()
     new_data_thresh = summed_data.copy()
     new_data_thresh[new_data_thresh < absorbance_threshold] = 0
 
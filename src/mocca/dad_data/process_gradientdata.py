@@ -5,11 +5,51 @@ Created on Wed Aug  4 15:44:47 2021
 
 @author: haascp
 """
+import os
+import functools
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
 import numpy as np
 from scipy import sparse
+from scipy.linalg import solveh_banded
 from scipy.sparse.linalg import spsolve
 
 
+@functools.lru_cache(maxsize=8)
+def get_penalty_matrix(length, lam):
+    """
+    Returns the penalty term lam * D * D^T of the asymmetric least squares
+    baseline algorithm, where D is the second-difference matrix, in CSR format
+    together with the positions of its diagonal in the CSR data array. The term
+    only depends on the length of the signal and the smoothness parameter, so
+    it is built once and shared by all wavelengths of a run (and by all runs of
+    the same length).
+    """
+    D = sparse.diags([1, -2, 1], [0, -1, -2], shape=(length, length - 2))
+    penalty = sparse.csr_matrix(lam * D.dot(D.transpose()))
+    penalty.sort_indices()
+    rows = np.repeat(np.arange(length), np.diff(penalty.indptr))
+    diag_idx = np.flatnonzero(penalty.indices == rows)
+    return penalty, diag_idx
+
+
+@functools.lru_cache(maxsize=8)
+def get_banded_penalty_matrix(length, lam):
+    """
+    Returns the penalty term lam * D * D^T of the asymmetric least squares
+    baseline algorithm in the upper banded storage format used by
+    scipy.linalg.solveh_banded. Row 2 holds the main diagonal, rows 1 and 0 the
+    first and second superdiagonal.
+    """
+    penalty, _ = get_penalty_matrix(length, lam)
+    ab = np.zeros((3, length))
+    ab[0, 2:] = penalty.diagonal(2)
+    ab[1, 1:] = penalty.diagonal(1)
+    ab[2] = penalty.diagonal(0)
+    ab.flags.writeable = False
+    return ab
+
+
 def bsl_als_alg(y, lam=1e5, p=0.01, niter=3):
     """
     Baseline correction algorithm: Optimized Python implementation of
@@ -35,7 +75,9 @@ def bsl_als_alg(y, lam=1e5, p=0.01, niter=3):
         To emphasize the basic simplicity of the algorithm, the number of
         iterations has been fixed to 10 (original documentation). In practical
         applications one should check whether the weights show any change;
-        if not, convergence has been attained.
+        if not, convergence has been attained. Therefore, niter is the
+        maximum number of iterations and the algorithm stops early if the
+        weights do not change anymore.
         The default is 3.
 
     Returns
@@ -44,24 +86,63 @@ def bsl_als_alg(y, lam=1e5, p=0.01, niter=3):
         Simulated baseline of the given absorbance data.
     """
     L = len(y)
-    D = sparse.diags([1, -2, 1], [0, -1, -2], shape=(L, L - 2))
-    # Precompute this term since it does not depend on `w`
-    D = lam * D.dot(D.transpose())
+    # Precomputed term since it does not depend on `w`
+    D, diag_idx = get_penalty_matrix(L, lam)
     w = np.ones(L)
-    W = sparse.spdiags(w, 0, L, L)
     for i in range(niter):
-        W.setdiag(w)  # Do not create a new matrix, just update diagonal values
-        Z = W + D
+        # W + D only differs from D on the diagonal, reuse the sparsity pattern
+        Z_data = D.data.copy()
+        Z_data[diag_idx] += w
         # somehow necessary since matrix can get singular
         # https://stackoverflow.com/questions/48370035/a-is-not-invertible-but-\
         # a-1-00001-is
-        Z = Z * 1.00000000000001
+        Z_data *= 1.00000000000001
+        Z = sparse.csr_matrix((Z_data, D.indices, D.indptr), shape=(L, L))
         z = spsolve(Z, w*y)
-        w = p * (y > z) + (1-p) * (y < z)
+        new_w = p * (y > z) + (1-p) * (y < z)
+        if np.array_equal(new_w, w):
+            # weights did not change, further iterations give the same baseline
+            break
+        w = new_w
+    return z
+
+
+def bsl_als_alg_banded(y, lam=1e5, p=0.01, niter=3):
+    """
+    Banded solver backend of the asymmetric least squares baseline algorithm
+    (see bsl_als_alg for the parameters). The system (W + lam * D * D^T) is
+    symmetric positive-definite and pentadiagonal, so every iteration is solved
+    by a banded Cholesky decomposition in O(n). Iterations stop early as soon
+    as the weights do not change anymore.
+    """
+    y = np.asarray(y, dtype=float)
+    L = len(y)
+    ab_penalty = get_banded_penalty_matrix(L, lam)
+    w = np.ones(L)
+    ab = np.empty_like(ab_penalty)
+    for i in range(niter):
+        ab[:] = ab_penalty
+        ab[2] += w
+        try:
+            z = solveh_banded(ab, w*y, overwrite_ab=True, check_finite=False)
+        except np.linalg.LinAlgError:
+            # numerically not positive-definite, use the general sparse solver
+            return bsl_als_alg(y, lam, p, niter)
+        new_w = p * (y > z) + (1-p) * (y < z)
+        if np.array_equal(new_w, w):
+            break
+        w = new_w
     return z
 
 
-def bsl_als(absorbance_array):
+BASELINE_BACKENDS = {
+    'sparse': bsl_als_alg,
+    'banded': bsl_als_alg_banded
+}
+
+
+def bsl_als(absorbance_array, lam=1e5, p=0.01, niter=3, backend='banded',
+            n_jobs=1, use_processes=False):
     """
     Applies the baseline als algorithm row-wise (for every wavelength) on an
     absorbance array
@@ -70,11 +151,41 @@ def bsl_als(absorbance_array):
     ----------
     absorbance_arry : numpy 2D-array
         Absorbance values obtained by an HPLC run (time, wavelength dimension).
+    lam : numeric, optional
+        Smoothness parameter, see bsl_als_alg. The default is 1e5.
+    p : numeric, optional
+        Asymmetry parameter, see bsl_als_alg. The default is 0.01.
+    niter : integer, optional
+        Maximum number of iterations, see bsl_als_alg. The default is 3.
+    backend : str, optional
+        Linear solver used in every iteration. 'banded' uses a banded Cholesky
+        solver, 'sparse' the general sparse solver. The default is 'banded'.
+    n_jobs : integer, optional
+        Number of workers the wavelengths are distributed to. 1 runs all
+        wavelengths serially, -1 uses all available CPUs. The default is 1.
+    use_processes : bool, optional
+        If True, a process pool is used instead of a thread pool. Only relevant
+        if n_jobs is not 1. The default is False.
 
     Returns
     -------
     baseline_array : numpy 2D-array
         Baseline absorbance values
     """
-    baseline_array = np.apply_along_axis(bsl_als_alg, 1, absorbance_array)
+    if backend not in BASELINE_BACKENDS:
+        raise ValueError(f"Given baseline backend {backend} is not defined in "
+                         f"MOCCA. Choose one of {list(BASELINE_BACKENDS)}.")
+    alg = functools.partial(BASELINE_BACKENDS[backend], lam=lam, p=p, niter=niter)
+    if n_jobs == -1:
+        n_jobs = os.cpu_count()
+    if n_jobs == 1 or len(absorbance_array) < 2:
+        baselines = [alg(y) for y in absorbance_array]
+    else:
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        # larger chunks reduce the pickling overhead of process pools
+        chunksize = max(1, len(absorbance_array) // (4 * n_jobs))
+        with executor_class(max_workers=n_jobs) as executor:
+            baselines = list(executor.map(alg, absorbance_array,
+                                          chunksize=chunksize))
+    baseline_array = np.array(baselines)
     return baseline_array
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 18:30:14 2026
+
+@author: haascp
+
+Resampling of HPLC-DAD data on common time grids. All readers give equidistant
+time vectors of the form [1, 2, ..., n] * time_step, so runs resampled with the
+same time step share the same grid and index-based peak positions are
+comparable between runs. Data of high-rate detectors can additionally be
+binned or decimated in time to reduce the number of time points.
+"""
+
+import numpy as np
+from scipy.interpolate import CubicSpline
+from scipy.signal import firwin, filtfilt
+
+RESAMPLING_METHODS = ['linear', 'spline']
+BINNING_METHODS = ['mean', 'decimate']
+
+
+def get_time_step(time):
+    """
+    Returns the time step of an equidistant time vector.
+    """
+    if len(time) < 2:
+        return time[-1] / len(time)
+    return (time[-1] - time[0]) / (len(time) - 1)
+
+
+def get_time_grid(time_step, max_time):
+    """
+    Returns the time grid [1, 2, ..., n] * time_step covering the time up to
+    max_time.
+    """
+    # small tolerance so that max_time itself is part of the grid
+    n_times = int(np.floor(max_time / time_step + 1e-9))
+    return np.arange(1, n_times + 1, dtype=float) * time_step
+
+
+def interpolate_data(data, time, new_time, method='linear'):
+    """
+    Interpolates the absorbance data with the shape
+    [# of wavelengths] x [timepoints] at the given new time points for all
+    wavelengths at once. New time points outside of the recorded time range
+    get the values at the border of the range. The method is either 'linear'
+    or 'spline' (cubic spline).
+    """
+    time = np.asarray(time, dtype=float)
+    new_time = np.clip(new_time, time[0], time[-1])
+    if method == 'linear':
+        idx = np.clip(np.searchsorted(time, new_time, side='right') - 1, 0,
+                      len(time) - 2)
+        weights = ((new_time - time[idx]) / (time[idx + 1] - time[idx])).\
+            astype(data.dtype)
+        new_data = data[:, idx] * (1 - weights)
+        new_data += data[:, idx + 1] * weights
+        return new_data
+    if method == 'spline':
+        new_data = CubicSpline(time, data, axis=1)(new_time)
+        return new_data.astype(data.dtype, copy=False)
+    raise ValueError(f"Given resampling method {method} is not defined in "
+                     f"MOCCA. Choose one of {RESAMPLING_METHODS}.")
+
+
+def resample_data(data, time, time_step, method='linear'):
+    """
+    Resamples the absorbance data on the time grid with the given time step.
+    Returns the data and time vector unchanged if they already are on this
+    grid.
+    """
+    new_time = get_time_grid(time_step, time[-1])
+    if len(new_time) == len(time) and np.allclose(new_time, time, rtol=0,
+                                                  atol=1e-9 * time_step):
+        return data, time
+    return interpolate_data(data, time, new_time, method), new_time
+
+
+def bin_data(data, time, bin_factor, method='mean'):
+    """
+    Reduces the number of time points of the absorbance data by the given
+    factor. With the method 'mean', the data are averaged over bins of
+    bin_factor time points and incomplete bins at the end are dropped. The
+    time vector gives the centers of the bins, so that peak indices map to the
+    retention times of the original data. With the method 'decimate', a
+    zero-phase FIR anti-aliasing filter is applied before every bin_factor-th
+    time point is taken. The data are padded by odd extension for filtering,
+    so that the baseline at the borders of the run is kept.
+    """
+    if data.shape[1] != len(time):
+        raise ValueError(f"Data with {data.shape[1]} time points do not match "
+                         f"the time vector with {len(time)} time points.")
+    if bin_factor == 1:
+        return data, time
+    if method == 'mean':
+        n_bins = len(time) // bin_factor
+        n_times = n_bins * bin_factor
+        new_data = data[:, :n_times].reshape(data.shape[0], n_bins,
+                                             bin_factor).mean(axis=2)
+        new_time = time[:n_times].reshape(n_bins, bin_factor).mean(axis=1)
+        return new_data, new_time
+    if method == 'decimate':
+        # same filter as in scipy.signal.decimate
+        coeffs = firwin(20 * bin_factor + 1, 1 / bin_factor, window='hamming')
+        new_data = filtfilt(coeffs, 1., data, axis=1,
+                            padlen=min(3 * len(coeffs), len(time) - 1))
+        return (np.ascontiguousarray(new_data[:, ::bin_factor],
+                                     dtype=data.dtype), time[::bin_factor])
+    raise ValueError(f"Given binning method {method} is not defined in "
+                     f"MOCCA. Choose one of {BINNING_METHODS}.")
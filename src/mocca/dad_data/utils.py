@@ -59,6 +59,31 @@ def df_to_array(df):
     return data, time, wavelength
 
 
+def get_time_vector(time):
+    """
+    Returns an equidistant time vector with the same length as the given time
+    vector. The acquisition time is calculated from the maximum time and the
+    number of recorded time points.
+    """
+    time = np.asarray(time, dtype=float)
+    acq_time = time.max() / len(time)
+    return np.arange(1, len(time) + 1, dtype=float) * acq_time
+
+
+def wide_df_to_arrays(dataframe):
+    """
+    Takes a wide dataframe of HPLC-DAD data, in which the first column is time
+    and the following columns contain the absorbance values at the detection
+    wavelength given in the column name. Returns a numpy array of absorbance
+    values with the shape [# of wavelengths] x [timepoints] as well as a vector
+    for the time domain and a vector for the wavelength domain.
+    """
+    data = np.ascontiguousarray(dataframe.iloc[:, 1:].to_numpy(dtype=float).T)
+    time = get_time_vector(dataframe.iloc[:, 0].to_numpy(dtype=float))
+    wavelength = dataframe.columns[1:].astype(float).to_numpy()
+    return data, time, wavelength
+
+
 def get_reference_signal(dataframe, bandwidth=5):
     """
     Returns the averaged signal over the last number of wavelengths as given by
@@ -98,3 +123,100 @@ def apply_filter(dataframe, wl_high_pass, wl_low_pass, bandwidth=2,
     if wl_low_pass:
         df = df[df.wavelength <= wl_low_pass]
     return df
+
+
+def get_array_reference_signal(data, bandwidth=5):
+    """
+    Returns the averaged signal over the last number of wavelengths as given by
+    the bandwidth. Array counterpart of get_reference_signal.
+    """
+    return data[-bandwidth:].mean(axis=0)
+
+
+def smooth_array(data, window, dtype=None):
+    """
+    Centered moving average of the given window length in the wavelength
+    dimension of a 2D DAD array. Only fully covered wavelengths are returned,
+    i.e., the result is shorter than the input by window - 1 wavelengths.
+    The result is allocated in the given dtype (default: dtype of data).
+    """
+    n_wls = data.shape[0] - window + 1
+    # summing shifted views keeps the summation order of a plain mean and is
+    # faster than a running-sum filter for the small windows used in MOCCA
+    smoothed = np.array(data[:n_wls], dtype=dtype)
+    for i in range(1, window):
+        smoothed += data[i:i + n_wls]
+    smoothed /= window
+    return smoothed
+
+
+def get_filter_slices(wavelength, wl_high_pass, wl_low_pass, bandwidth=2,
+                      reference_wl=True, reference_bandwidth=5):
+    """
+    Returns the slices of raw wavelength indices which are required by
+    apply_array_filter to filter the data to the given wavelength window,
+    i.e., the window itself plus the smoothing margin and the reference band at
+    the end of the spectrum. Filtering only the data of these wavelengths gives
+    the same result as filtering the full spectrum. Readers use these slices to
+    load only the required part of the data. If the wavelengths are not
+    increasing, all wavelengths are required.
+    """
+    wavelength = np.asarray(wavelength, dtype=float)
+    n_wls = len(wavelength)
+    window = bandwidth + 1
+    all_wls = [slice(0, n_wls)]
+    if (not wl_high_pass and not wl_low_pass) or n_wls < window or \
+            np.any(np.diff(wavelength) <= 0):
+        return all_wls
+    # wavelengths of the smoothed data are the window centers
+    centers = wavelength[window // 2:window // 2 + n_wls - window + 1]
+    wl_mask = np.ones(len(centers), dtype=bool)
+    if wl_high_pass:
+        wl_mask &= centers >= wl_high_pass
+    if wl_low_pass:
+        wl_mask &= centers <= wl_low_pass
+    slices = []
+    if wl_mask.any():
+        smoothed_idx = np.flatnonzero(wl_mask)
+        slices.append(slice(smoothed_idx[0], smoothed_idx[-1] + window))
+    if reference_wl:
+        reference_start = max(0, n_wls - reference_bandwidth - window + 1)
+        if slices and slices[0].stop >= reference_start:
+            slices[0] = slice(min(slices[0].start, reference_start), n_wls)
+        else:
+            slices.append(slice(reference_start, n_wls))
+    return slices or all_wls
+
+
+def get_filter_index(wavelength, wl_high_pass, wl_low_pass):
+    """
+    Returns the sorted raw wavelength indices required by apply_array_filter
+    with default parameters (see get_filter_slices).
+    """
+    return np.r_[tuple(get_filter_slices(wavelength, wl_high_pass, wl_low_pass))]
+
+
+def apply_array_filter(data, wavelength, wl_high_pass, wl_low_pass, bandwidth=2,
+                       reference_wl=True, dtype=None):
+    """
+    Filters absorbance data of 2D DAD arrays with the shape
+    [# of wavelengths] x [timepoints] to remove noise and background
+    systematic error. Array counterpart of apply_filter which works without
+    creating a tidy dataframe. Returns the filtered data in the given dtype
+    (default: dtype of data) and the corresponding wavelength vector.
+    """
+    window = bandwidth + 1
+    smoothed = smooth_array(data, window, dtype)
+    wavelength = np.asarray(wavelength, dtype=float)
+    wavelength = wavelength[window // 2:window // 2 + smoothed.shape[0]]
+    if reference_wl:
+        smoothed -= get_array_reference_signal(smoothed)
+    wl_mask = np.ones(len(wavelength), dtype=bool)
+    if wl_high_pass:
+        wl_mask &= wavelength >= wl_high_pass
+    if wl_low_pass:
+        wl_mask &= wavelength <= wl_low_pass
+    if not wl_mask.all():
+        smoothed = smoothed[wl_mask]
+        wavelength = wavelength[wl_mask]
+    return smoothed, wavelength
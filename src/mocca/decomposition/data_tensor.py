@@ -87,18 +87,20 @@ def get_tensor_boundaries(impure_peak, relevant_comp, iter_offset):
     return (left, right)
 
 
-def get_zeros_array(boundaries, n_wavelengths):
+def get_zeros_array(boundaries, n_wavelengths, dtype=float):
     """
     Retruns array of zeros in the shape of the wavelengths and boundaries.
     """
-    return np.zeros((n_wavelengths, boundaries[1] - boundaries[0] + 1))
+    return np.zeros((n_wavelengths, boundaries[1] - boundaries[0] + 1),
+                    dtype=dtype)
 
 
 def get_zero_extended_peak_data(peak_data, left, boundaries):
     """
     Returns zero-extended (to the boundaries) peak data.
     """
-    peak_data_ze = get_zeros_array(boundaries, peak_data.shape[0])
+    peak_data_ze = get_zeros_array(boundaries, peak_data.shape[0],
+                                   peak_data.dtype)
     rel_left = left - boundaries[0]
     rel_right = rel_left + peak_data.shape[1]
     peak_data_ze[:, rel_left:rel_right] = peak_data
@@ -166,16 +168,17 @@ def normalize_peak_data(parafac_data):
     return data_normalized
 
 
-def create_data_tensor(parafac_data):
+def create_data_tensor(parafac_data, dtype=None):
     """
     Takes a list of peak data and returns a data tensor in the format used for
-    PARAFAC decomposition.
+    PARAFAC decomposition. If no dtype is given, the dtype is determined by the
+    peak data.
     """
     # add all data to data_flattened and create data tensor
     data_flattened = []
     for data in parafac_data:
         data_flattened.append(data[:, :, np.newaxis])
-    data_tensor = np.concatenate(data_flattened, axis=2)
+    data_tensor = np.concatenate(data_flattened, axis=2, dtype=dtype)
     return data_tensor
 
 
@@ -186,6 +189,7 @@ def get_parafac_tensor(impure_peak, quali_comp_db, iter_offset,
     the qualitative component db and an iteration offset and returns a
     DataTensor object which is used for PARAFAC decomposition.
     """
+    dtype = impure_peak.dataset.data.dtype
     relevant_comp = get_relevant_comp(impure_peak, quali_comp_db)
 
     boundaries = get_tensor_boundaries(impure_peak, relevant_comp, iter_offset)
@@ -199,7 +203,7 @@ def get_parafac_tensor(impure_peak, quali_comp_db, iter_offset,
 
     parafac_data = comp_peaks + [impure_peak]
     normalized_data = normalize_peak_data(parafac_data)
-    data_tensor = create_data_tensor(normalized_data)
+    data_tensor = create_data_tensor(normalized_data, dtype)
 
     if show_parafac_analytics:
         print(f"new data tensor with boundaries {boundaries} and shape"
@@ -5,11 +5,10 @@ Created on Fri Jan 14 08:57:14 2022
 
 @author: haascp
 """
-from sklearn.decomposition import PCA
 from tensorly.decomposition import non_negative_parafac_hals
 import matplotlib.pyplot as plt
 
-from mocca.peak.utils import get_peak_data
+from mocca.peak.utils import get_peak_data, get_explained_variance_ratios
 from mocca.decomposition.data_tensor import get_parafac_tensor
 from mocca.decomposition.model import ParafacModel
 
@@ -20,16 +19,14 @@ def estimate_pca_n_comps(data_tensor, impure_peak, show_parafac_analytics):
     """
     pca_data = data_tensor.reshape(get_peak_data(impure_peak).shape[0], -1)
 
-    n_components = min(pca_data.shape[0], 10)
-    pca = PCA(n_components=n_components)
-    _ = pca.fit_transform(pca_data)
+    explained_variance_ratios = get_explained_variance_ratios(pca_data)
 
     #  same thresh than in peak.check, check_peak_purity
     threshold = 0.995
     cum_sum = 0
     pca_explained_variance = []
-    for idx in range(10):
-        cum_sum += pca.explained_variance_ratio_[idx]
+    for idx in range(min(len(explained_variance_ratios), 10)):
+        cum_sum += explained_variance_ratios[idx]
         if show_parafac_analytics:
             print(f"Cumulative variance after {idx + 1} PCA components: {cum_sum}")
         pca_explained_variance.append(cum_sum)
@@ -8,8 +8,6 @@ Created on Fri Jan 14 09:01:51 2022
 import numpy as np
 import itertools
 
-from mocca.dad_data.utils import sum_absorbance_by_time
-
 
 def check_comp_overlap(peak, comp):
     """
@@ -92,5 +90,5 @@ def check_absorbance_thresh(parafac_peak, absorbance_threshold):
     Checks if maximum absorbance in synthetically created PARAFAC peak dataset
     exceeds absorbance threshold.
     """
-    max_absorbance = np.max(sum_absorbance_by_time(parafac_peak.dataset.data))
+    max_absorbance = np.max(parafac_peak.dataset.get_summed_trace())
     return max_absorbance > absorbance_threshold
@@ -18,10 +18,9 @@ def expand_peak(picked_peak, absorbance_threshold):
     threshold. Returns a picked peak with modified peak boundaries (left, right).
     """
     expand_threshold = absorbance_threshold / 20
-    # sum absorbances over all wavelengths
-    data = np.sum(picked_peak.dataset.data, axis=0)
-    # smoothing filter on time axis with a window length of 5
-    data = np.convolve(data, np.ones(5), 'same') / 5
+    # absorbances summed over all wavelengths and smoothed on time axis with a
+    # window length of 5, computed once per dataset
+    data = picked_peak.dataset.get_smoothed_trace(5)
 
     left = picked_peak.left
     right = picked_peak.right
@@ -6,10 +6,10 @@ Created on Tue Nov 23 15:55:25 2021
 @author: haascp
 """
 
-from mocca.peak.utils import get_peak_data, is_unimodal
+from mocca.peak.utils import (get_peak_data, is_unimodal,
+                              get_explained_variance_ratios)
 
 import numpy as np
-from sklearn.decomposition import PCA
 
 
 def get_trimmed_peak_data(peak):
@@ -33,33 +33,40 @@ def get_noise_variance(peak):
     """
     Filters dataset with only timepoints whose max absorbance at
     any wavelength is below 1% of max absorbance. Returns the average of the
-    variance over all wavelengths.
+    variance over all wavelengths. The noise variance is computed only once
+    per dataset.
     """
-    noise_data = peak.dataset.data[:, np.max(peak.dataset.data, axis=0) <
-                                   0.01 * np.max(peak.dataset.data)]
-    return np.mean(np.var(noise_data, axis=0))
+    return peak.dataset.get_noise_variance()
 
 
 def get_correls(peak_data, max_loc):
     """
-    Get a list with correlation coefficients of UV-Vis spectra at every
+    Get a list with squared correlation coefficients of UV-Vis spectra at every
     timepoint with reference to the UV-Vis spectrum at maximum absorbance.
+    The correlations of all timepoints are computed at once as normalized dot
+    products of the centered spectra.
     """
-    correls_to_max = [(np.corrcoef(peak_data[:, i],
-                                   peak_data[:, max_loc])[0, 1])**2
-                      for i in range(peak_data.shape[1])]
-    return correls_to_max
+    centered = peak_data - np.mean(peak_data, axis=0)
+    norms = np.sqrt(np.einsum('ij,ij->j', centered, centered))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correls = (centered[:, max_loc] @ centered) / (norms * norms[max_loc])
+    # as in np.corrcoef, constant spectra give nan
+    correls_to_max = np.clip(correls, -1, 1)**2
+    return correls_to_max.tolist()
 
 
 def get_agilent_thresholds(peak_data, max_loc, noise_variance, param=2.5):
     """
-    Returns the thresholds calculated by the Agilent purity algorithm.
+    Returns the thresholds calculated by the Agilent purity algorithm for
+    every timepoint.
     """
-    agilent_thresholds = [(max(0, 1 - param *
-                               (noise_variance / np.var(peak_data[:, i]) +
-                                noise_variance / np.var(peak_data[:, max_loc]))))**2  # noqa: E501
-                          for i in range(peak_data.shape[1])]
-    return agilent_thresholds
+    variances = np.var(peak_data, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        thresholds = 1 - param * (noise_variance / variances +
+                                  noise_variance / variances[max_loc])
+    # fmax ignores nan like the builtin max(0, nan)
+    agilent_thresholds = np.fmax(0, thresholds)**2
+    return agilent_thresholds.tolist()
 
 
 def get_purity_value_agilent(peak_data, correls, agilent_thresholds):
@@ -87,6 +94,4 @@ def get_pca_explained_variance(peak_data):
     Calculates the ration of explained variance by the first principal
     component of the devonvoluted peak data.
     """
-    pca = PCA(n_components=1)
-    pca.fit(peak_data)
-    return pca.explained_variance_ratio_[0]
+    return get_explained_variance_ratios(peak_data)[0]
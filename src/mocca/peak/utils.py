@@ -36,6 +36,27 @@ def average_peak_spectrum(peak):
     return np.average(get_peak_data(peak), axis=1).tolist()
 
 
+def get_explained_variance_ratios(data):
+    """
+    Returns the ratios of the variance explained by all principal components
+    of the data with samples in rows and features in columns in descending
+    order, as given by sklearn.decomposition.PCA. The variances are the
+    squared singular values of the centered data or, if one dimension of the
+    data is much smaller, e.g., for narrow peaks, the eigenvalues of the small
+    Gram matrix.
+    """
+    centered = data - np.mean(data, axis=0)
+    n_rows, n_cols = centered.shape
+    if 2 * min(n_rows, n_cols) <= max(n_rows, n_cols):
+        gram = (centered.T @ centered if n_cols < n_rows else
+                centered @ centered.T)
+        # eigenvalues in ascending order, rounding errors may give negatives
+        variances = np.clip(np.linalg.eigvalsh(gram)[::-1], 0, None)
+    else:
+        variances = np.linalg.svd(centered, compute_uv=False)**2
+    return variances / np.sum(variances)
+
+
 def is_unimodal(L, high_val_threshold=math.inf):
     """
     Checks if a list is unimodal (for use in peak purity).
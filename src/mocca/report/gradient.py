@@ -44,14 +44,14 @@ def create_gradient_pages(gradients):
     for i, gradient in enumerate(gradients):
         gradient_df = pd.DataFrame({
             'time': gradient.time,
-            'absorbance': sum_absorbance_by_time(gradient.original_data)
+            'absorbance': sum_absorbance_by_time(gradient.get_original_data())
             })
         gradient_plot = plot_1D_data(gradient_df, xlabel='Time (min)',
                                      ylabel='Summed absorbance (mAU)',
                                      title='', reduce_data=True)
         baseline_df = pd.DataFrame({
             'time': gradient.time,
-            'absorbance': sum_absorbance_by_time(gradient.data)
+            'absorbance': gradient.get_summed_trace()
             })
         baseline_plot = plot_1D_data(baseline_df, xlabel='Time (min)',
                                      ylabel='Summed absorbance (mAU)',
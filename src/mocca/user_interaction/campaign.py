@@ -5,6 +5,7 @@ Created on Mon Dec 13 09:05:19 2021
 
 @author: haascp
 """
+import os
 import logging
 import dill
 
@@ -17,6 +18,8 @@ from mocca.components.databases import QuantComponentDatabase
 from mocca.campaign.process_funcs import process_compound_experiments
 from mocca.campaign.process_funcs import process_experiments
 from mocca.campaign.process_funcs import process_gradients
+from mocca.campaign.utils import get_lazy_dir
+from mocca.dad_data.cache import clean_lazy_dir
 
 
 class HplcDadCampaign():
@@ -104,6 +107,10 @@ class HplcDadCampaign():
         """
         self.settings = settings
         self._reset_campaign()
+        lazy_dir = get_lazy_dir(settings)
+        if lazy_dir and os.name != 'posix':
+            # files of arrays released by the reset can be removed now
+            clean_lazy_dir(lazy_dir)
 
         process_gradients(self.hplc_inputs, self.settings)
 
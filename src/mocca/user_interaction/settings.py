@@ -7,6 +7,11 @@ Created on Tue Dec 21 14:57:25 2021
 """
 from dataclasses import dataclass
 from typing import Optional
+import numpy as np
+
+from mocca.dad_data.apis.registry import get_reader
+from mocca.dad_data.resample import RESAMPLING_METHODS, BINNING_METHODS
+from mocca.dad_data.process_gradientdata import BASELINE_BACKENDS
 
 
 @dataclass()
@@ -23,25 +28,54 @@ class Settings():
     peaks_low_pass : Optional[float] = None
     spectrum_correl_thresh : Optional[float] = 0.95  # Value between 0 and 1
     relative_distance_thresh : Optional[float] = 0.01  # Value between 0 and 1
+    baseline_lam : Optional[float] = 1e5
+    baseline_p : Optional[float] = 0.01
+    baseline_niter : Optional[int] = 3
+    baseline_backend : Optional[str] = 'banded'  # 'banded' or 'sparse'
+    baseline_n_jobs : Optional[int] = 1  # -1 uses all CPUs
+    baseline_use_processes : Optional[bool] = False
+    compact_gradients : Optional[bool] = False  # do not keep raw gradient data
+    cache_dir : Optional[str] = None  # directory to cache processed gradients
+    cache_raw_data : Optional[bool] = False  # also cache parsed raw data
+    lazy_data : Optional[bool] = False  # keep DAD data memory-mapped on disk
+    dtype : Optional[str] = 'float64'  # 'float32' halves memory of DAD data
+    prefetch : Optional[int] = 0  # number of runs read ahead in background
+    time_resampling : Optional[str] = None  # 'linear' or 'spline'
+    time_step : Optional[float] = None  # in min, default: gradient time step
+    time_bin_factor : Optional[int] = 1  # time points combined to one
+    time_binning : Optional[str] = 'mean'  # 'mean' or 'decimate'
 
     def __post_init__(self):
+        try:
+            reader = get_reader(self.hplc_system_tag)
+        except ValueError:
+            raise AttributeError(f"HPLC System Tag {self.hplc_system_tag} n"
+                                 "ot supported!")
         if self.detector_limit is None:
-            if (self.hplc_system_tag == 'chemstation' or
-                    self.hplc_system_tag == 'angi'):
-                self.detector_limit = float("inf")
-            elif self.hplc_system_tag == 'labsolutions':
-                self.detector_limit = float("inf")
-            elif self.hplc_system_tag == 'empower':
-                self.detector_limit = float("inf")
-            elif self.hplc_system_tag == 'allotrope':
-                self.detector_limit = float("inf")
-            elif self.hplc_system_tag == 'custom':
-                self.detector_limit = float("inf")
-            else:
-                raise AttributeError(f"HPLC System Tag {self.hplc_system_tag} n"
-                                     "ot supported!")
-        if self.hplc_system_tag == 'custom' and (self.wl_high_pass or
-                                                 self.wl_low_pass):
+            self.detector_limit = reader.detector_limit
+        if self.baseline_backend not in BASELINE_BACKENDS:
+            raise AttributeError(f"Baseline backend {self.baseline_backend} not "
+                                 f"supported! Use one of "
+                                 f"{list(BASELINE_BACKENDS)}.")
+        if np.dtype(self.dtype).kind != 'f':
+            raise AttributeError(f"Data type {self.dtype} not supported! Use a "
+                                 "floating point type like float32 or float64.")
+        if self.time_resampling and self.time_resampling not in \
+                RESAMPLING_METHODS:
+            raise AttributeError(f"Time resampling method {self.time_resampling}"
+                                 f" not supported! Use one of "
+                                 f"{RESAMPLING_METHODS}.")
+        if self.time_step is not None and self.time_step <= 0:
+            raise AttributeError("Time step has to be positive!")
+        if int(self.time_bin_factor) != self.time_bin_factor or \
+                self.time_bin_factor < 1:
+            raise AttributeError("Time bin factor has to be a positive "
+                                 "integer!")
+        if self.time_binning not in BINNING_METHODS:
+            raise AttributeError(f"Time binning method {self.time_binning} "
+                                 f"not supported! Use one of "
+                                 f"{BINNING_METHODS}.")
+        if not reader.wl_filter and (self.wl_high_pass or self.wl_low_pass):
             raise AttributeError("Wavelength high and low pass filters are not "
-                                 "supported for custom data. Provide already "
-                                 "trimmed data!")
+                                 f"supported for {self.hplc_system_tag} data. "
+                                 "Provide already trimmed data!")
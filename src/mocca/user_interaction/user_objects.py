@@ -55,17 +55,49 @@ class InternalStandard():
 class CustomData():
     """
     Data container to store custom data like, e.g., from HPLC chromatogram
-    simulations.
+    simulations. The data are given with the shape [# of wavelengths] x
+    [timepoints] as numpy array or any object supporting the buffer protocol
+    or the numpy array interface (e.g., memoryview or Arrow arrays). C-contiguous
+    floating point data are used without copying, other data are copied once
+    into a C-contiguous float array. If in_place is True, MOCCA may modify the
+    given data in place (e.g., by baseline subtraction) instead of copying them.
+    Such data are marked as consumed after they were modified and cannot be
+    processed again.
     """
     data: np.ndarray
     time: list
     wavelength: list
+    in_place: bool = False
+    consumed: bool = field(default=False, init=False)
 
     def __post_init__(self):
+        self.data = np.asarray(self.data)
         self._check_custom_data()
+        if not np.issubdtype(self.data.dtype, np.floating):
+            self.data = self.data.astype(float)
+        elif not self.data.flags.c_contiguous:
+            self.data = np.ascontiguousarray(self.data)
+        if self.in_place and not self.data.flags.writeable:
+            raise ValueError("Read-only data cannot be modified in place.")
+
+    @classmethod
+    def from_buffer(cls, buffer, time, wavelength, dtype=None, in_place=False):
+        """
+        Creates custom data from the given buffer without copying. If a dtype is
+        given, the buffer is interpreted as raw bytes of this dtype. Otherwise,
+        the dtype and shape of the buffer are used. Flat buffers are reshaped
+        to [# of wavelengths] x [timepoints].
+        """
+        if dtype is not None:
+            data = np.frombuffer(buffer, dtype=dtype)
+        else:
+            data = np.asarray(buffer)
+        if data.ndim == 1:
+            data = data.reshape(len(wavelength), len(time))
+        return cls(data, time, wavelength, in_place)
 
     def _check_custom_data(self):
-        if (self.data.shape[0] != len(self.wavelength) or
+        if (self.data.ndim != 2 or self.data.shape[0] != len(self.wavelength) or
                 self.data.shape[1] != len(self.time)):
             raise ValueError("Data must be given as a two-dimensional numpy "
                              "ndarray with the shape (len(wavelenght), "
@@ -8,15 +8,13 @@ Created on Fri Jan  7 15:12:02 2022
 import pandas as pd
 import altair as alt
 
-from mocca.dad_data.utils import sum_absorbance_by_time
-
 
 def plot_chrom_with_peaks(chrom):
     """Plots summed absorbance vs time with highlighted picked peak zones."""
 
     df = pd.DataFrame({
         'time': chrom.dataset.time,
-        'absorbance': sum_absorbance_by_time(chrom.dataset.data)
+        'absorbance': chrom.dataset.get_summed_trace()
         })
     fac = df.shape[0] // 1000
     if fac > 0:
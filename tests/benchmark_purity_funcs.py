@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:12:37 2026
+
+@author: haascp
+
+Micro-benchmark of the vectorized peak purity statistics against the former
+per-column loops on a wide peak. Run with: python tests/benchmark_purity_funcs.py
+"""
+import timeit
+
+from mocca.peak.purity_funcs import (get_correls, get_agilent_thresholds,
+                                     get_max_loc)
+from test_peak_purity_funcs import (get_correls_loop,
+                                    get_agilent_thresholds_loop,
+                                    create_peak_data)
+
+
+def time_func(func, repeat=5):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+if __name__ == '__main__':
+    for n_times in [100, 500, 2000]:
+        peak_data = create_peak_data(n_times)
+        max_loc = get_max_loc(peak_data)
+        loop_time = time_func(
+            lambda: (get_correls_loop(peak_data, max_loc),
+                     get_agilent_thresholds_loop(peak_data, max_loc, 1e-4)))
+        vectorized_time = time_func(
+            lambda: (get_correls(peak_data, max_loc),
+                     get_agilent_thresholds(peak_data, max_loc, 1e-4)))
+        print(f"{n_times} time points: loop {loop_time * 1000:.1f} ms, "
+              f"vectorized {vectorized_time * 1000:.2f} ms, speedup "
+              f"{loop_time / vectorized_time:.0f}x")
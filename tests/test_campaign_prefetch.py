@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:40:52 2026
+
+@author: haascp
+"""
+import threading
+import time
+import pytest
+
+from mocca.campaign.utils import prefetch
+
+
+class CountingFunc():
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = 0
+        self.consumed = 0
+        self.max_ahead = 0
+
+    def __call__(self, item):
+        with self.lock:
+            self.started += 1
+            self.max_ahead = max(self.max_ahead, self.started - self.consumed)
+        time.sleep(0.001)
+        if item == 'error':
+            raise ValueError(item)
+        return item * 2
+
+
+@pytest.mark.parametrize("n_prefetch", [0, 1, 3])
+def test_prefetch_order(n_prefetch):
+    func = CountingFunc()
+    results = []
+    for item, result in prefetch(func, range(20), n_prefetch):
+        time.sleep(0.002)
+        with func.lock:
+            func.consumed += 1
+        results.append((item, result))
+    assert results == [(i, 2 * i) for i in range(20)]
+    # the current item plus at most n_prefetch items ahead
+    assert func.max_ahead <= n_prefetch + 1
+
+
+def test_prefetch_error():
+    results = []
+    with pytest.raises(ValueError):
+        for item, result in prefetch(CountingFunc(), [1, 2, 'error', 3], 2):
+            results.append(result)
+    assert results == [2, 4]
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:12:26 2026
+
+@author: haascp
+"""
+from types import SimpleNamespace
+import numpy as np
+import pytest
+
+from mocca.user_interaction.user_objects import (CustomData, HplcInput,
+                                                 Compound)
+from mocca.user_interaction.campaign import HplcDadCampaign
+from mocca.user_interaction.settings import Settings
+from mocca.dad_data.models import CompoundData
+
+WAVELENGTH = np.arange(200., 220., 2.)
+TIME = np.arange(1, 51) * 0.01
+
+
+def create_data():
+    rng = np.random.default_rng(0)
+    return rng.random((len(WAVELENGTH), len(TIME)))
+
+
+def create_gradient(n_times=len(TIME)):
+    return SimpleNamespace(dataset=SimpleNamespace(
+        data=np.full((len(WAVELENGTH), n_times), 0.5)))
+
+
+def test_custom_data_zero_copy():
+    data = create_data()
+    assert CustomData(data, TIME, WAVELENGTH).data is data
+    custom_data = CustomData(memoryview(data), TIME, WAVELENGTH)
+    assert np.shares_memory(custom_data.data, data)
+    custom_data = CustomData.from_buffer(data.tobytes(), TIME, WAVELENGTH,
+                                         dtype=float)
+    np.testing.assert_array_equal(custom_data.data, data)
+    custom_data = CustomData.from_buffer(memoryview(data.ravel()), TIME,
+                                         WAVELENGTH)
+    assert np.shares_memory(custom_data.data, data)
+    assert custom_data.data.shape == data.shape
+
+
+def test_custom_data_conversion():
+    data = create_data()
+    custom_data = CustomData(np.asfortranarray(data), TIME, WAVELENGTH)
+    assert custom_data.data.flags.c_contiguous
+    custom_data = CustomData((data * 100).astype(int), TIME, WAVELENGTH)
+    assert custom_data.data.dtype == float
+    with pytest.raises(ValueError):
+        CustomData(data[:, :-1], TIME, WAVELENGTH)
+    with pytest.raises(ValueError):
+        CustomData.from_buffer(data.tobytes(), TIME, WAVELENGTH, dtype=float,
+                               in_place=True)
+
+
+@pytest.mark.parametrize("in_place", [False, True])
+@pytest.mark.parametrize("n_gradient_times", [len(TIME), len(TIME) - 10])
+def test_custom_data_baseline_subtraction(in_place, n_gradient_times):
+    data = create_data()
+    original_data = data.copy()
+    experiment = HplcInput('test', create_gradient(n_gradient_times),
+                           custom_data=CustomData(data, TIME, WAVELENGTH,
+                                                  in_place))
+    dataset = CompoundData('custom', experiment)
+    expected = original_data[:, :n_gradient_times] - 0.5
+    np.testing.assert_array_equal(dataset.data, expected)
+    assert np.shares_memory(dataset.data, data) == in_place
+    if not in_place:
+        np.testing.assert_array_equal(data, original_data)
+
+
+def test_custom_data_in_place_consumed():
+    data = create_data()
+    custom_data = CustomData(data, TIME, WAVELENGTH, in_place=True)
+    experiment = HplcInput('test', create_gradient(), custom_data=custom_data)
+    dataset = CompoundData('custom', experiment)
+    assert custom_data.consumed
+    corrected_data = dataset.data.copy()
+    # baseline must not be subtracted twice from the same buffer
+    with pytest.raises(ValueError):
+        CompoundData('custom', experiment)
+    np.testing.assert_array_equal(data, corrected_data)
+    # data without gradient are not modified and can be processed again
+    custom_data = CustomData(create_data(), TIME, WAVELENGTH, in_place=True)
+    experiment = HplcInput('test', None, custom_data=custom_data)
+    CompoundData('custom', experiment)
+    assert not custom_data.consumed
+    CompoundData('custom', experiment)
+
+
+def test_custom_data_in_place_campaign_reprocessing():
+    campaign = HplcDadCampaign()
+    elution = np.exp(-(np.arange(len(TIME)) - 25) ** 2 / (2 * 3 ** 2))
+    spectrum = np.exp(-(WAVELENGTH - 210) ** 2 / 50)
+    for name, conc in [('a1', 1.0), ('a2', 2.0)]:
+        data = 1000 * conc * np.outer(spectrum, elution) + create_data() * 0.01
+        campaign.add_hplc_input(HplcInput(name, None, Compound('A', conc),
+                                          custom_data=CustomData(
+                                              data, TIME, WAVELENGTH,
+                                              in_place=True)))
+    settings = Settings('custom', absorbance_threshold=50)
+    results = []
+    # campaigns are reprocessed, e.g., after compounds were added
+    for _ in range(2):
+        campaign.process_all_hplc_input(settings)
+        results.append([(peak.compound_id, peak.integral) for chrom in
+                        campaign.chroms for peak in chrom.peaks])
+    assert results[0] and results[0] == results[1]
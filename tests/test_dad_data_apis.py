@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:02:17 2026
+
+@author: haascp
+"""
+import struct
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+
+from mocca.dad_data.apis.empower import read_arw_empower
+from mocca.dad_data.apis.labsolutions import read_txt_shimadzu, read_labsolutions
+from mocca.dad_data.apis.empower import read_empower
+from mocca.dad_data.apis.chemstation import read_chemstation, read_csv_agilent
+from mocca.dad_data.apis.chemstation_uv import read_uv_agilent
+from mocca.dad_data.apis.angi import read_angi
+from mocca.dad_data.apis import allotrope
+from mocca.dad_data.utils import apply_array_filter, wide_df_to_arrays
+
+WAVELENGTH = np.arange(200., 260., 2.)
+N_TIME = 50
+
+
+def create_absorbance():
+    rng = np.random.default_rng(0)
+    return np.round(rng.random((N_TIME, len(WAVELENGTH))), 3)
+
+
+def write_arw_file(path, absorbance, raw_time):
+    with open(path, 'w') as file:
+        file.write('"SampleName"\t"x"\n"Channel"\t"PDA"\n')
+        file.write('Wavelength\t' + '\t'.join(f'{w:.1f}' for w in WAVELENGTH) +
+                   '\n')
+        file.write('Time\t' + '\t' * (len(WAVELENGTH) - 1) + '\n')
+        file.write('\t' + '\t'.join('AU' for w in WAVELENGTH) + '\n')
+        for t, row in zip(raw_time, absorbance):
+            file.write(f'{t}\t' + '\t'.join(f'{a:.3f}' for a in row) + '\t\n')
+
+
+def test_read_arw_empower(tmp_path):
+    absorbance = create_absorbance()
+    raw_time = np.round(np.arange(N_TIME) * 0.01 + 0.01, 4)
+    path = tmp_path / 'run.arw'
+    write_arw_file(path, absorbance, raw_time)
+    data, time, wavelength = read_arw_empower(path)
+    np.testing.assert_array_equal(wavelength, WAVELENGTH)
+    np.testing.assert_allclose(data, absorbance.T)
+    assert data.shape == (len(WAVELENGTH), N_TIME)
+    assert data.flags.c_contiguous
+    np.testing.assert_allclose(time, np.arange(1, N_TIME + 1) *
+                               raw_time.max() / N_TIME)
+
+
+def write_txt_file(path, absorbance, raw_time):
+    with open(path, 'w') as file:
+        file.write('[Header]\nApplication Name,LabSolutions\n\n[PDA 3D]\n'
+                   f'Interval(msec),600\n# of Points,{N_TIME}\n')
+        file.write('R.Time (min),' +
+                   ','.join(str(int(w * 100)) for w in WAVELENGTH) + '\n')
+        for t, row in zip(raw_time, absorbance):
+            file.write(f'{t},' + ','.join(str(int(round(a * 1000)))
+                                          for a in row) + '\n')
+        file.write('\n[LC Status Trace(Pump A Pressure)]\nInterval,500\n')
+
+
+def test_read_txt_shimadzu(tmp_path):
+    absorbance = create_absorbance()
+    raw_time = np.round(np.arange(N_TIME) * 0.01 + 0.01, 4)
+    path = tmp_path / 'run.txt'
+    write_txt_file(path, absorbance, raw_time)
+    data, time, wavelength = read_txt_shimadzu(path)
+    np.testing.assert_allclose(wavelength, WAVELENGTH)
+    np.testing.assert_allclose(data, absorbance.T)
+    assert data.dtype == float and data.flags.c_contiguous
+    np.testing.assert_allclose(time, np.arange(1, N_TIME + 1) *
+                               raw_time.max() / N_TIME)
+
+
+def write_csv_file(path, absorbance, raw_time):
+    df = pd.DataFrame(absorbance, columns=[f'{w:g}' for w in WAVELENGTH])
+    df.insert(0, 'Time (min)', raw_time)
+    path.mkdir()
+    with open(path / 'DAD1.CSV', 'w', encoding='utf-16') as file:
+        df.to_csv(file, index=False)
+
+
+def read_csv_agilent_arrays(path):
+    return wide_df_to_arrays(read_csv_agilent(path))
+
+
+def write_angi_file(path, absorbance, raw_time):
+    df = pd.DataFrame(absorbance, columns=[f'{w:g}' for w in WAVELENGTH])
+    df.insert(0, 'Time (min)', raw_time)
+    df.to_csv(path, index=False)
+
+
+def read_angi_arrays(path):
+    return wide_df_to_arrays(pd.read_csv(path))
+
+
+@pytest.mark.parametrize("wl_high_pass, wl_low_pass",
+                         [(None, None), (210, 230), (None, 220), (211, None),
+                          (250, None)])
+@pytest.mark.parametrize("read_func, raw_read_func, write_func, file_name",
+                         [(read_empower, read_arw_empower, write_arw_file,
+                           'run.arw'),
+                          (read_labsolutions, read_txt_shimadzu, write_txt_file,
+                           'run.txt'),
+                          (read_chemstation, read_csv_agilent_arrays,
+                           write_csv_file, 'run.D'),
+                          (read_angi, read_angi_arrays, write_angi_file,
+                           'run.csv')])
+def test_wavelength_pushdown(tmp_path, read_func, raw_read_func, write_func,
+                             file_name, wl_high_pass, wl_low_pass):
+    absorbance = create_absorbance()
+    raw_time = np.round(np.arange(N_TIME) * 0.01 + 0.01, 4)
+    path = tmp_path / file_name
+    write_func(path, absorbance, raw_time)
+    # full spectrum parsed and filtered afterwards
+    raw_data, raw_time, raw_wavelength = raw_read_func(path)
+    assert len(raw_wavelength) == len(WAVELENGTH)
+    expected_data, expected_wavelength = apply_array_filter(
+        raw_data, raw_wavelength, wl_high_pass, wl_low_pass)
+
+    data, time, wavelength = read_func(path, wl_high_pass, wl_low_pass)
+    np.testing.assert_array_equal(wavelength, expected_wavelength)
+    np.testing.assert_array_equal(data, expected_data)
+    np.testing.assert_array_equal(time, raw_time)
+
+
+def write_uv_file(path, raw_absorbance, raw_time_ms, wl_start=4000, wl_step=40,
+                  double_file=False, scaling_factor=0.001, version='131'):
+    n_times, n_wls = raw_absorbance.shape
+    if version == '131':
+        header = bytearray(0x1000)
+        file_type = 'OL DATA FILE' if double_file else 'LC DATA FILE'
+        header[0x15B] = len(file_type)
+        header[0x15C:0x15C + 2 * len(file_type)] = file_type.encode('utf-16-le')
+        scaling_offset = 0xC0D
+    else:
+        # older files without file type string, always delta encoded
+        header = bytearray(0x200)
+        scaling_offset = 0x13E
+    header[0] = len(version)
+    header[1:1 + len(version)] = version.encode()
+    header[0x116:0x11A] = struct.pack('>I', n_times)
+    header[scaling_offset:scaling_offset + 8] = struct.pack('>d', scaling_factor)
+    records = bytearray()
+    for t, spectrum in zip(raw_time_ms, raw_absorbance):
+        if double_file:
+            payload = struct.pack(f'<{n_wls}d', *spectrum)
+        else:
+            payload = bytearray()
+            previous = None
+            for value in spectrum:
+                delta = None if previous is None else int(value) - previous
+                if delta is None or not -32767 <= delta <= 32767:
+                    payload += struct.pack('<hi', -32768, int(value))
+                else:
+                    payload += struct.pack('<h', delta)
+                previous = int(value)
+        records += struct.pack('<HHI3H8x', 0, 22 + len(payload), int(t),
+                               wl_start, wl_start + (n_wls - 1) * wl_step,
+                               wl_step)
+        records += payload
+    path.mkdir()
+    with open(path / 'DAD1.UV', 'wb') as file:
+        file.write(header + records)
+
+
+def create_uv_absorbance():
+    rng = np.random.default_rng(0)
+    raw_absorbance = rng.integers(-50000, 50000, (N_TIME, len(WAVELENGTH)))
+    raw_absorbance[:, ::3] = rng.integers(-100, 100, (N_TIME, 10)) * 1000
+    # absolute values which contain the escape value in their lower word
+    raw_absorbance[::7, 5] = 0x18000
+    raw_absorbance[::5, 6] = -0x8000
+    return raw_absorbance
+
+
+@pytest.mark.parametrize("version, double_file", [('131', False),
+                                                  ('131', True),
+                                                  ('31', False)])
+def test_read_uv_agilent(tmp_path, version, double_file):
+    raw_absorbance = create_uv_absorbance()
+    raw_time_ms = np.arange(1, N_TIME + 1) * 600
+    path = tmp_path / 'run.D'
+    write_uv_file(path, raw_absorbance, raw_time_ms, double_file=double_file,
+                  version=version)
+
+    data, time, wavelength = read_uv_agilent(path)
+    np.testing.assert_allclose(wavelength, WAVELENGTH)
+    np.testing.assert_allclose(data, raw_absorbance.T * 0.001)
+    assert data.shape == (len(WAVELENGTH), N_TIME) and data.flags.c_contiguous
+    np.testing.assert_allclose(time, raw_time_ms / 60000)
+
+
+def test_adf_description_cache_threads(tmp_path, monkeypatch):
+    monkeypatch.setattr(allotrope, 'ADF_DESCRIPTION_CACHE', {})
+    monkeypatch.setattr(allotrope, 'ADF_DESCRIPTION_CACHE_SIZE', 4)
+    monkeypatch.setattr(allotrope, 'read_adf_description',
+                        lambda file: (file, 1., 190.))
+    paths = []
+    for i in range(20):
+        paths.append(tmp_path / f'run_{i}.adf')
+        paths[-1].write_bytes(b'adf')
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        descriptions = list(executor.map(
+            lambda path: allotrope.get_adf_description(str(path), path),
+            paths * 20))
+    assert descriptions == [(str(path), 1., 190.) for path in paths * 20]
+    assert len(allotrope.ADF_DESCRIPTION_CACHE) <= 4
+
+
+@pytest.mark.skipif(importlib.util.find_spec('h5ld') is not None,
+                    reason="h5ld is installed")
+def test_adf_description_missing_h5ld():
+    with pytest.raises(ImportError, match="h5ld"):
+        allotrope.read_adf_description(None)
+
+
+@pytest.mark.parametrize("version, double_file", [('131', False),
+                                                  ('131', True),
+                                                  ('31', False)])
+def test_read_uv_agilent_rainbow(tmp_path, version, double_file):
+    # cross-check of the file layout with the independent parser of the
+    # rainbow-api package
+    rainbow_chemstation = pytest.importorskip('rainbow.agilent.chemstation')
+    raw_absorbance = create_uv_absorbance()
+    raw_time_ms = np.arange(1, N_TIME + 1) * 600
+    path = tmp_path / 'run.D'
+    write_uv_file(path, raw_absorbance, raw_time_ms, double_file=double_file,
+                  version=version, scaling_factor=0.25)
+    data_file = rainbow_chemstation.parse_uv(str(path / 'DAD1.UV'))
+    data, time, wavelength = read_uv_agilent(path)
+    np.testing.assert_allclose(data, data_file.data.T)
+    np.testing.assert_allclose(wavelength, data_file.ylabels)
+    np.testing.assert_allclose(time, data_file.xlabels)
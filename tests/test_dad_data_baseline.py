@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:52:40 2026
+
+@author: haascp
+"""
+import numpy as np
+import pytest
+
+from mocca.dad_data.process_gradientdata import bsl_als, bsl_als_alg
+from mocca.user_interaction.settings import Settings
+
+
+def create_gradient_data(n_wls=8, n_times=500, seed=0):
+    rng = np.random.default_rng(seed)
+    time = np.linspace(0, 1, n_times)
+    drift = np.outer(np.linspace(1, 2, n_wls), 5 * time + np.sin(3 * time))
+    peaks = 20 * np.exp(-(np.arange(n_times) - 250) ** 2 / 50)
+    return drift + peaks + rng.normal(0, 0.05, (n_wls, n_times))
+
+
+def test_bsl_als_backends_agree():
+    data = create_gradient_data()
+    sparse_baseline = bsl_als(data, backend='sparse')
+    banded_baseline = bsl_als(data, backend='banded')
+    np.testing.assert_allclose(banded_baseline, sparse_baseline, rtol=0,
+                               atol=1e-6)
+
+
+@pytest.mark.parametrize("backend", ['sparse', 'banded'])
+def test_bsl_als_converged_weights(backend):
+    data = create_gradient_data(n_wls=2)
+    # more iterations than needed for convergence stop early with the
+    # same result
+    np.testing.assert_array_equal(bsl_als(data, niter=50, backend=backend),
+                                  bsl_als(data, niter=100, backend=backend))
+
+
+def test_bsl_als_parallel():
+    data = create_gradient_data()
+    np.testing.assert_array_equal(bsl_als(data, n_jobs=2), bsl_als(data))
+
+
+def test_bsl_als_alg_shape():
+    y = create_gradient_data(n_wls=1)[0]
+    assert bsl_als_alg(y).shape == y.shape
+
+
+def test_bsl_als_unknown_backend():
+    with pytest.raises(ValueError):
+        bsl_als(create_gradient_data(n_wls=1), backend='dense')
+    with pytest.raises(AttributeError):
+        Settings('chemstation', baseline_backend='dense')
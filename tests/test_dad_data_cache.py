@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 12:31:15 2026
+
+@author: haascp
+"""
+import os
+import numpy as np
+
+from mocca.dad_data.cache import (get_content_hash, get_file_stamp,
+                                  get_cache_key, load_cached_arrays,
+                                  save_cached_arrays, store_array_lazily,
+                                  is_memory_mapped, clean_lazy_dir)
+
+
+def test_get_content_hash(tmp_path):
+    run_dir = tmp_path / "run.D"
+    run_dir.mkdir()
+    (run_dir / "DAD1.CSV").write_text("1,2,3")
+    hash_1 = get_content_hash(str(run_dir))
+    assert hash_1 == get_content_hash(str(run_dir))
+    (run_dir / "DAD1.CSV").write_text("1,2,4")
+    assert get_content_hash(str(run_dir)) != hash_1
+
+
+def test_get_file_stamp(tmp_path):
+    path = tmp_path / "run.arw"
+    path.write_text("1\t2\t3")
+    stamp = get_file_stamp(str(path))
+    assert stamp == get_file_stamp(str(path))
+    path.write_text("1\t2\t3\t4")
+    assert get_file_stamp(str(path)) != stamp
+
+
+def test_cached_arrays_roundtrip(tmp_path):
+    key = get_cache_key("abc", "chemstation", None, 400)
+    assert load_cached_arrays(str(tmp_path), 'gradients', key, ['data']) is None
+
+    data = np.arange(12, dtype=float).reshape(3, 4)
+    save_cached_arrays(str(tmp_path), 'gradients', key, {'data': data})
+    arrays = load_cached_arrays(str(tmp_path), 'gradients', key, ['data'])
+    np.testing.assert_array_equal(arrays['data'], data)
+    assert not arrays['data'].flags.writeable
+
+
+def test_store_array_lazily(tmp_path):
+    data = np.random.default_rng(0).normal(size=(5, 100))
+    lazy_data = store_array_lazily(data, str(tmp_path))
+    assert is_memory_mapped(lazy_data)
+    assert not is_memory_mapped(data)
+    np.testing.assert_array_equal(lazy_data[:, 10:20], data[:, 10:20])
+    assert store_array_lazily(lazy_data, str(tmp_path)) is lazy_data
+
+
+def test_clean_lazy_dir(tmp_path, monkeypatch):
+    # behave like systems which cannot unlink mapped files
+    monkeypatch.setattr(os, 'name', 'nt')
+    lazy_data = store_array_lazily(np.ones((2, 10)), str(tmp_path))
+    (tmp_path / 'other.npy').write_bytes(b'')
+    assert len(os.listdir(tmp_path)) == 2
+    del lazy_data
+    clean_lazy_dir(str(tmp_path))
+    assert os.listdir(tmp_path) == ['other.npy']
+    clean_lazy_dir(str(tmp_path / 'missing'))
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:55:08 2026
+
+@author: haascp
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from mocca.dad_data.models import GradientData, CompoundData
+from mocca.dad_data.apis.chemstation import read_chemstation
+from mocca.user_interaction.user_objects import HplcInput, Gradient
+
+WAVELENGTH = np.arange(200., 260., 2.)
+TIME = np.arange(1, 201) * 0.01
+
+
+def write_gradient(path, time=TIME, seed=0):
+    rng = np.random.default_rng(seed)
+    absorbance = (np.exp(-(WAVELENGTH[None, :] - 200) / 40) *
+                  (1 + time[:, None]) + rng.normal(0, 0.01, (len(time),
+                                                             len(WAVELENGTH))))
+    df = pd.DataFrame(absorbance, columns=[f'{w:g}' for w in WAVELENGTH])
+    df.insert(0, 'Time (min)', time)
+    path.mkdir()
+    with open(path / 'DAD1.CSV', 'w', encoding='utf-16') as file:
+        df.to_csv(file, index=False)
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_gradient_compact(tmp_path, use_cache):
+    path = tmp_path / 'gradient.D'
+    write_gradient(path)
+    cache_dir = str(tmp_path / 'cache') if use_cache else None
+    gradient = GradientData('chemstation', HplcInput(str(path), None),
+                            wl_high_pass=210, cache_dir=cache_dir)
+    assert not np.shares_memory(gradient.original_data, gradient.data)
+    for _ in range(2 if use_cache else 1):
+        compact_gradient = GradientData('chemstation', HplcInput(str(path), None),
+                                        wl_high_pass=210, cache_dir=cache_dir,
+                                        compact=True)
+        assert compact_gradient.original_data is None
+        np.testing.assert_array_equal(compact_gradient.data, gradient.data)
+        np.testing.assert_array_equal(compact_gradient.get_original_data(),
+                                      gradient.get_original_data())
+    assert not any(isinstance(value, HplcInput) for value in
+                   compact_gradient.read_params.values())
+    if use_cache:
+        # original data are loaded from the gradient cache
+        (path / 'DAD1.CSV').unlink()
+        np.testing.assert_array_equal(compact_gradient.get_original_data(),
+                                      gradient.original_data)
+
+
+@pytest.mark.parametrize("n_run_times", [len(TIME), len(TIME) + 20,
+                                         len(TIME) - 20])
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_compound_data_baseline_subtraction(tmp_path, n_run_times, use_cache):
+    gradient_path = tmp_path / 'gradient.D'
+    write_gradient(gradient_path)
+    run_path = tmp_path / 'run.D'
+    write_gradient(run_path, np.arange(1, n_run_times + 1) * 0.01, seed=1)
+    gradient = Gradient(str(gradient_path))
+    gradient.dataset = GradientData('chemstation', HplcInput(str(gradient_path),
+                                                             None))
+    raw_cache_dir = str(tmp_path / 'cache') if use_cache else None
+    n_times = min(len(TIME), n_run_times)
+    raw_data, _, _ = read_chemstation(str(run_path))
+    expected = raw_data[:, :n_times] - gradient.dataset.data[:, :n_times]
+    for _ in range(2):
+        dataset = CompoundData('chemstation', HplcInput(str(run_path), gradient),
+                               raw_cache_dir=raw_cache_dir)
+        np.testing.assert_allclose(dataset.data, expected, rtol=0, atol=1e-12)
+        assert dataset.data.shape[1] == len(dataset.time) == n_times
+
+
+@pytest.mark.parametrize("method", ['linear', 'spline'])
+def test_compound_data_resampling(tmp_path, method):
+    gradient_path = tmp_path / 'gradient.D'
+    write_gradient(gradient_path)
+    run_path = tmp_path / 'run.D'
+    # slower acquisition rate than the gradient
+    write_gradient(run_path, np.arange(1, 161) * 0.0125, seed=1)
+    gradient = Gradient(str(gradient_path))
+    gradient.dataset = GradientData('chemstation', HplcInput(str(gradient_path),
+                                                             None),
+                                    resample_params={'method': method})
+    np.testing.assert_array_equal(gradient.dataset.time, TIME)
+    dataset = CompoundData('chemstation', HplcInput(str(run_path), gradient),
+                           resample_params={'method': method})
+    np.testing.assert_allclose(dataset.time, TIME)
+    assert dataset.data.shape == gradient.dataset.data.shape
+    # run and gradient only differ by noise after alignment
+    assert np.abs(dataset.data).max() < 0.1
+
+
+@pytest.mark.parametrize("binning", ['mean', 'decimate'])
+def test_compound_data_binning(tmp_path, binning):
+    gradient_path = tmp_path / 'gradient.D'
+    write_gradient(gradient_path)
+    run_path = tmp_path / 'run.D'
+    write_gradient(run_path, np.arange(1, 161) * 0.0125, seed=1)
+    resample_params = {'method': 'linear', 'bin_factor': 4,
+                       'binning': binning}
+    gradient = Gradient(str(gradient_path))
+    gradient.dataset = GradientData('chemstation', HplcInput(str(gradient_path),
+                                                             None),
+                                    resample_params=resample_params)
+    assert len(gradient.dataset.time) == len(TIME) // 4
+    assert gradient.dataset.get_original_data().shape == \
+        gradient.dataset.data.shape
+    dataset = CompoundData('chemstation', HplcInput(str(run_path), gradient),
+                           resample_params=resample_params)
+    np.testing.assert_allclose(dataset.time, gradient.dataset.time)
+    assert np.abs(dataset.data).max() < 0.1
+
+
+def test_derived_traces(tmp_path):
+    path = tmp_path / 'gradient.D'
+    write_gradient(path)
+    dataset = GradientData('chemstation', HplcInput(str(path), None))
+    # noise of the data after the first 100 time points
+    dataset.data[:, 100:] = np.random.default_rng(0).normal(
+        0, 1e-3, (len(dataset.wavelength), len(TIME) - 100))
+    summed = dataset.get_summed_trace()
+    np.testing.assert_array_equal(summed, np.sum(dataset.data, axis=0))
+    assert dataset.get_summed_trace() is summed and not summed.flags.writeable
+    np.testing.assert_array_equal(dataset.get_smoothed_trace(),
+                                  np.convolve(summed, np.ones(5), 'same') / 5)
+    assert dataset.get_max_absorbance() == dataset.data.max()
+    np.testing.assert_array_equal(dataset.get_noise_mask(),
+                                  dataset.data.max(axis=0) <
+                                  0.01 * dataset.data.max())
+    noise_variance = dataset.get_noise_variance()
+    assert noise_variance > 0
+    assert noise_variance == np.mean(np.var(
+        dataset.data[:, dataset.get_noise_mask()], axis=0))
+
+    dataset.data = dataset.data * 2
+    np.testing.assert_allclose(dataset.get_summed_trace(), 2 * summed)
+    assert dataset.get_noise_variance() == pytest.approx(4 * noise_variance)
+    dataset.data[:] = 0
+    dataset.invalidate_cache()
+    assert not dataset.get_summed_trace().any()
+    assert dataset.get_max_absorbance() == 0
+
+
+def test_derived_traces_in_place_subtraction(tmp_path):
+    gradient_path = tmp_path / 'gradient.D'
+    write_gradient(gradient_path)
+    gradient = GradientData('chemstation', HplcInput(str(gradient_path), None))
+    dataset = CompoundData('chemstation', HplcInput(str(gradient_path), None))
+    summed = dataset.get_summed_trace().copy()
+    dataset._subtract_baseline(gradient, in_place=True)
+    np.testing.assert_allclose(dataset.get_summed_trace(),
+                               summed - gradient.get_summed_trace())
+
+
+def test_compound_data_trimmed_buffer(tmp_path):
+    gradient_path = tmp_path / 'gradient.D'
+    write_gradient(gradient_path)
+    run_path = tmp_path / 'run.D'
+    write_gradient(run_path, np.arange(1, 251) * 0.01, seed=1)
+    gradient = Gradient(str(gradient_path))
+    gradient.dataset = GradientData('chemstation', HplcInput(str(gradient_path),
+                                                             None))
+    dataset = CompoundData('chemstation', HplcInput(str(run_path), gradient))
+    assert dataset.data.shape[1] == len(TIME)
+    # the untrimmed reader buffer must not be kept alive by a view
+    assert dataset.data.base is None
+    raw_data = read_chemstation(str(run_path))[0]
+    np.testing.assert_allclose(dataset.data, raw_data[:, :len(TIME)] -
+                               gradient.dataset.data)
+
+
+def test_compound_data_in_place_dtype(tmp_path):
+    gradient_path = tmp_path / 'gradient.D'
+    write_gradient(gradient_path)
+    gradient = GradientData('chemstation', HplcInput(str(gradient_path), None))
+    dataset = CompoundData('chemstation', HplcInput(str(gradient_path), None))
+    int_data = np.ones_like(dataset.data, dtype=int)
+    dataset.data = int_data
+    # a float baseline is not truncated into an integer buffer
+    dataset._subtract_baseline(gradient, in_place=True)
+    assert not np.shares_memory(dataset.data, int_data)
+    assert (int_data == 1).all()
+    np.testing.assert_allclose(dataset.data, 1 - gradient.data)
+
+
+def test_compound_data_resampling_without_time_step(tmp_path):
+    run_path = tmp_path / 'run.D'
+    write_gradient(run_path, np.arange(1, 161) * 0.0125)
+    with pytest.raises(ValueError):
+        CompoundData('chemstation', HplcInput(str(run_path), None),
+                     resample_params={'method': 'linear'})
+    dataset = CompoundData('chemstation', HplcInput(str(run_path), None),
+                           resample_params={'method': 'linear',
+                                            'time_step': 0.01})
+    np.testing.assert_allclose(dataset.time, TIME)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:41:03 2026
+
+@author: haascp
+"""
+import numpy as np
+import pytest
+
+from mocca.peak.models import BasePeak
+from mocca.chromatogram.utils import check_overlap
+from mocca.dad_data.process_funcs import get_peak_locs, merge_peaks
+
+
+def merge_peaks_recursive(summed_data, peaks):
+    """
+    Former pairwise and recursive implementation of merge_peaks.
+    """
+    new_peaks = set()
+    for cur_peak in peaks:
+        overlapping_peaks = []
+        for other in peaks:
+            if check_overlap(cur_peak, other):
+                overlapping_peaks.append(other)
+
+        merged_peak = [-1, np.inf, 0]
+        for peak in overlapping_peaks:
+            merged_peak[0] = (peak.maximum if summed_data[peak.maximum] >
+                              summed_data[merged_peak[0]] or merged_peak[0] == -1
+                              else merged_peak[0])
+            merged_peak[1] = min(merged_peak[1], peak.left)
+            merged_peak[2] = max(merged_peak[2], peak.right)
+        new_peaks.add(tuple(merged_peak))
+
+    new_peaks = sorted(new_peaks, key=lambda x: x[0])
+    peak_list = [BasePeak(maximum=maximum, left=left, right=right, offset=0)
+                 for maximum, left, right in new_peaks]
+    if peak_list == peaks:
+        return peak_list
+    elif len(merge_peaks_recursive(summed_data, peak_list)) < len(peak_list):
+        return merge_peaks_recursive(summed_data, peak_list)
+    return peak_list
+
+
+def create_summed_data(rng, n_times=2000):
+    summed_data = np.zeros(n_times)
+    for _ in range(rng.integers(1, 40)):
+        maximum = rng.uniform(0, n_times)
+        width = rng.uniform(2, 50)
+        summed_data += rng.uniform(100, 5000) * np.exp(
+            -(np.arange(n_times) - maximum) ** 2 / (2 * width ** 2))
+    return summed_data + rng.normal(0, 20, n_times)
+
+
+def create_random_peaks(rng, summed_data):
+    peaks = []
+    for _ in range(rng.integers(0, 60)):
+        left, right = np.sort(rng.integers(0, len(summed_data), 2))
+        peaks.append(BasePeak(left=int(left), right=int(right),
+                              maximum=int(rng.integers(left, right + 1)),
+                              offset=0))
+    return sorted(peaks, key=lambda peak: peak.maximum)
+
+
+def is_disjoint(peaks):
+    return not any(check_overlap(peak, other) for i, peak in enumerate(peaks)
+                   for other in peaks[i + 1:])
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_merge_peaks_equivalence(seed):
+    rng = np.random.default_rng(seed)
+    summed_data = create_summed_data(rng)
+    threshold_data = summed_data.copy()
+    threshold_data[threshold_data < rng.uniform(0, 500)] = 0
+    for peaks in [get_peak_locs(threshold_data),
+                  create_random_peaks(rng, summed_data)]:
+        merged_peaks = merge_peaks(summed_data, peaks)
+        assert is_disjoint(merged_peaks)
+        assert merged_peaks == sorted(merged_peaks,
+                                      key=lambda peak: peak.maximum)
+        # every peak lies within exactly one merged peak
+        for peak in peaks:
+            assert sum(merged.left <= peak.left and peak.right <= merged.right
+                       for merged in merged_peaks) == 1
+        # the recursive implementation may stop before long chains of
+        # overlapping peaks are completely merged
+        expected_peaks = merge_peaks_recursive(summed_data, peaks)
+        if is_disjoint(expected_peaks):
+            assert merged_peaks == expected_peaks
+
+
+def test_merge_peaks_chain():
+    summed_data = np.arange(20.)
+    peaks = [BasePeak(left=i, right=i + 2, maximum=i + 1, offset=0)
+             for i in range(0, 18, 2)]
+    assert merge_peaks(summed_data, peaks) == [
+        BasePeak(left=0, right=18, maximum=17, offset=0)]
+    assert merge_peaks(summed_data, []) == []
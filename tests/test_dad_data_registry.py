@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:48:33 2026
+
+@author: haascp
+"""
+import numpy as np
+import pytest
+
+from mocca.dad_data.apis import registry
+from mocca.dad_data.apis.registry import DadReader, get_reader, register_reader
+from mocca.dad_data.models import CompoundData
+from mocca.user_interaction.user_objects import HplcInput
+from mocca.user_interaction.settings import Settings
+
+
+def read_test_data(path, wl_high_pass=None, wl_low_pass=None, dtype=None):
+    wavelength = np.arange(200., 220., 2.)
+    time = np.arange(1, 51) * 0.01
+    data = np.ones((len(wavelength), len(time)), dtype=dtype)
+    return data, time, wavelength
+
+
+class EntryPoint():
+    name = 'entry_point_hplc'
+
+    def load(self):
+        return read_test_data
+
+
+class EntryPoints(list):
+    def select(self, group):
+        return self if group == registry.ENTRY_POINT_GROUP else []
+
+
+@pytest.mark.parametrize("hplc_system_tag", ['chemstation', 'chemstation_uv', 'angi',
+                                             'labsolutions',
+                                             'empower', 'allotrope', 'custom'])
+def test_builtin_readers(hplc_system_tag):
+    reader = get_reader(hplc_system_tag)
+    assert reader.hplc_system_tag == hplc_system_tag
+    assert callable(reader.load())
+
+
+def test_unknown_reader():
+    with pytest.raises(ValueError):
+        get_reader('unknown_hplc')
+    with pytest.raises(AttributeError):
+        Settings('unknown_hplc')
+
+
+def test_register_reader(monkeypatch, tmp_path):
+    monkeypatch.setattr(registry, 'READERS', dict(registry.READERS))
+    reader = DadReader('test_hplc', f'{__name__}:read_test_data',
+                       detector_limit=2.)
+    register_reader(reader)
+    with pytest.raises(ValueError):
+        register_reader(reader)
+    assert Settings('test_hplc').detector_limit == 2.
+    dataset = CompoundData('test_hplc', HplcInput(str(tmp_path), None),
+                           dtype='float32')
+    assert dataset.data.shape == (10, 50)
+    assert dataset.data.dtype == np.float32
+    register_reader(DadReader('test_hplc', f'{__name__}:read_test_data',
+                              wl_filter=False), overwrite=True)
+    Settings('test_hplc')
+    with pytest.raises(AttributeError):
+        Settings('test_hplc', wl_high_pass=210)
+
+
+def test_entry_point_reader(monkeypatch, tmp_path):
+    monkeypatch.setattr(registry, 'READERS', dict(registry.READERS))
+    monkeypatch.setattr(registry, 'entry_points',
+                        lambda: EntryPoints([EntryPoint()]))
+    reader = get_reader('entry_point_hplc')
+    assert reader.load() is read_test_data
+    dataset = CompoundData('entry_point_hplc', HplcInput(str(tmp_path), None))
+    assert dataset.data.shape == (10, 50)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 18:52:36 2026
+
+@author: haascp
+"""
+import numpy as np
+import pytest
+
+from mocca.dad_data.resample import (get_time_step, get_time_grid,
+                                     resample_data, bin_data)
+
+TIME = np.arange(1, 401) * 0.0125
+
+
+def create_data(time):
+    return np.array([np.exp(-(time - 2.5) ** 2 / (2 * width ** 2))
+                     for width in [0.2, 0.3, 0.5]])
+
+
+def test_get_time_grid():
+    assert get_time_step(TIME) == pytest.approx(0.0125)
+    time = get_time_grid(0.01, TIME[-1])
+    assert len(time) == 500
+    np.testing.assert_allclose(time, np.arange(1, 501) * 0.01)
+
+
+@pytest.mark.parametrize("method, atol", [('linear', 1e-3), ('spline', 1e-5)])
+@pytest.mark.parametrize("time_step", [0.01, 0.02])
+def test_resample_data(method, atol, time_step):
+    data = create_data(TIME)
+    new_data, new_time = resample_data(data, TIME, time_step, method)
+    np.testing.assert_allclose(new_time, get_time_grid(time_step, TIME[-1]))
+    assert new_data.shape == (3, len(new_time))
+    np.testing.assert_allclose(new_data, create_data(new_time), rtol=0,
+                               atol=atol)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_resample_data_dtype(dtype):
+    data = create_data(TIME).astype(dtype)
+    new_data, _ = resample_data(data, TIME, 0.01)
+    assert new_data.dtype == dtype
+    same_data, same_time = resample_data(data, TIME, get_time_step(TIME))
+    assert same_data is data and same_time is TIME
+
+
+def test_resample_data_unknown_method():
+    with pytest.raises(ValueError):
+        resample_data(create_data(TIME), TIME, 0.01, 'nearest')
+
+
+@pytest.mark.parametrize("method", ['mean', 'decimate'])
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_bin_data(method, dtype):
+    data = create_data(TIME).astype(dtype)
+    # incomplete last bin is dropped in mean binning
+    n_bins = 99 if method == 'mean' else 100
+    new_data, new_time = bin_data(data[:, :-1], TIME[:-1], 4, method)
+    assert new_data.shape == (3, n_bins) and len(new_time) == n_bins
+    assert new_data.dtype == dtype and new_data.flags.c_contiguous
+    np.testing.assert_allclose(new_data, create_data(new_time), rtol=0,
+                               atol=5e-3)
+    # peak maxima stay at the retention time of the original data
+    assert new_time[new_data[0].argmax()] == pytest.approx(2.5, abs=0.025)
+    same_data, same_time = bin_data(data, TIME, 1, method)
+    assert same_data is data and same_time is TIME
+
+
+def test_bin_data_mean_time():
+    new_data, new_time = bin_data(create_data(TIME), TIME, 4)
+    np.testing.assert_allclose(new_time, TIME.reshape(-1, 4).mean(axis=1))
+    assert get_time_step(new_time) == pytest.approx(4 * get_time_step(TIME))
+    with pytest.raises(ValueError):
+        bin_data(new_data, new_time, 2, 'max')
+    with pytest.raises(ValueError):
+        bin_data(new_data, new_time[:-1], 2)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:12:03 2026
+
+@author: haascp
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from mocca.dad_data.utils import (apply_filter, df_to_array, get_reference_signal,
+                                  apply_array_filter, get_array_reference_signal,
+                                  get_filter_slices)
+
+
+def create_test_data(n_wls=40, n_times=300, seed=0):
+    rng = np.random.default_rng(seed)
+    data = rng.normal(0, 1, (n_wls, n_times)).cumsum(axis=0) + 100
+    wavelength = np.arange(n_wls) * 2. + 200
+    time = np.arange(1, n_times + 1) * 0.01
+    return data, time, wavelength
+
+
+def array_to_tidy_df(data, time, wavelength):
+    return pd.DataFrame({'time': np.tile(time, len(wavelength)),
+                         'wavelength': np.repeat(wavelength, len(time)),
+                         'absorbance': data.ravel()})
+
+
+def test_get_array_reference_signal():
+    data, time, wavelength = create_test_data()
+    df = array_to_tidy_df(data, time, wavelength)
+    np.testing.assert_allclose(get_array_reference_signal(data),
+                               get_reference_signal(df).absorbance.to_numpy(),
+                               rtol=0, atol=1e-10)
+
+
+@pytest.mark.parametrize("wl_high_pass, wl_low_pass",
+                         [(None, None), (220, 250), (None, 240), (211, None)])
+@pytest.mark.parametrize("bandwidth", [2, 3])
+@pytest.mark.parametrize("reference_wl", [True, False])
+def test_apply_array_filter(wl_high_pass, wl_low_pass, bandwidth, reference_wl):
+    data, time, wavelength = create_test_data()
+    df = array_to_tidy_df(data, time, wavelength)
+    df = apply_filter(df, wl_high_pass, wl_low_pass, bandwidth, reference_wl)
+    expected_data, _, expected_wavelength = df_to_array(df)
+
+    filtered_data, filtered_wavelength = apply_array_filter(
+        data, wavelength, wl_high_pass, wl_low_pass, bandwidth, reference_wl)
+
+    np.testing.assert_array_equal(filtered_wavelength, expected_wavelength)
+    np.testing.assert_allclose(filtered_data, expected_data, rtol=0, atol=1e-10)
+
+
+@pytest.mark.parametrize("wl_high_pass, wl_low_pass",
+                         [(None, None), (220, 250), (None, 240), (211, None),
+                          (200, 203), (262, 266), (270, None), (300, None),
+                          (None, 190)])
+@pytest.mark.parametrize("bandwidth", [2, 3])
+@pytest.mark.parametrize("reference_wl", [True, False])
+def test_get_filter_slices(wl_high_pass, wl_low_pass, bandwidth, reference_wl):
+    data, time, wavelength = create_test_data()
+    expected_data, expected_wavelength = apply_array_filter(
+        data, wavelength, wl_high_pass, wl_low_pass, bandwidth, reference_wl)
+
+    idx = np.r_[tuple(get_filter_slices(wavelength, wl_high_pass, wl_low_pass,
+                                        bandwidth, reference_wl))]
+    filtered_data, filtered_wavelength = apply_array_filter(
+        data[idx], wavelength[idx], wl_high_pass, wl_low_pass, bandwidth,
+        reference_wl)
+
+    np.testing.assert_array_equal(filtered_wavelength, expected_wavelength)
+    np.testing.assert_array_equal(filtered_data, expected_data)
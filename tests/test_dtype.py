@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:12:41 2026
+
+@author: haascp
+"""
+import numpy as np
+import pytest
+
+from mocca.user_interaction.campaign import HplcDadCampaign
+from mocca.user_interaction.user_objects import HplcInput, Compound, CustomData
+from mocca.user_interaction.settings import Settings
+from mocca.dad_data.models import CompoundData
+from mocca.decomposition.data_tensor import create_data_tensor
+
+WAVELENGTH = np.arange(200., 320., 2.)
+TIME = np.arange(1, 1501) * 0.004
+SPECTRA = [np.exp(-(WAVELENGTH - center) ** 2 / (2 * width ** 2))
+           for center, width in [(230, 12), (260, 15)]]
+
+
+def create_custom_data(peaks, seed):
+    rng = np.random.default_rng(seed)
+    data = np.zeros((len(WAVELENGTH), len(TIME)))
+    for spectrum_idx, (maximum, conc) in peaks.items():
+        elution = np.exp(-(np.arange(len(TIME)) - maximum) ** 2 / (2 * 8 ** 2))
+        data += 300 * conc * np.outer(SPECTRA[spectrum_idx], elution)
+    data += rng.normal(0, 0.01, data.shape)
+    return CustomData(data, TIME, WAVELENGTH)
+
+
+def run_campaign(dtype):
+    campaign = HplcDadCampaign()
+    runs = [('a1', {0: (300, 1.0)}, Compound('A', 1.0)),
+            ('a2', {0: (302, 2.0)}, Compound('A', 2.0)),
+            ('b1', {1: (700, 1.0)}, Compound('B', 1.0)),
+            ('b2', {1: (698, 0.5)}, Compound('B', 0.5)),
+            ('r1', {0: (301, 1.5), 1: (699, 0.7)}, None),
+            ('r2', {0: (299, 0.3), 1: (701, 1.2)}, None)]
+    for seed, (name, peaks, compound) in enumerate(runs):
+        campaign.add_hplc_input(HplcInput(f"{name}_{dtype}", None, compound,
+                                          custom_data=create_custom_data(peaks,
+                                                                         seed)))
+    settings = Settings('custom', absorbance_threshold=50, dtype=dtype)
+    campaign.process_all_hplc_input(settings)
+    return campaign
+
+
+def get_peak_results(campaign):
+    return [(peak.compound_id, peak.integral, peak.concentration)
+            for chrom in campaign.chroms for peak in chrom.peaks]
+
+
+def test_float32_campaign_drift():
+    results_64 = get_peak_results(run_campaign('float64'))
+    results_32 = get_peak_results(run_campaign('float32'))
+    assert len(results_64) == len(results_32) > 0
+    for (id_64, integral_64, conc_64), (id_32, integral_32, conc_32) in \
+            zip(results_64, results_32):
+        assert id_64 == id_32
+        assert integral_32 == pytest.approx(integral_64, rel=1e-4)
+        if conc_64 is None:
+            assert conc_32 is None
+        else:
+            assert conc_32 == pytest.approx(conc_64, rel=1e-4)
+
+
+def test_float32_campaign_dtype():
+    campaign = run_campaign('float32')
+    for chrom in campaign.chroms:
+        assert chrom.dataset.data.dtype == np.float32
+
+
+def test_compound_data_dtype():
+    custom_data = create_custom_data({0: (300, 1.0)}, 0)
+    for dtype in [np.float32, np.float64]:
+        dataset = CompoundData('custom', HplcInput('test', None,
+                                                   custom_data=custom_data),
+                               dtype=dtype)
+        assert dataset.data.dtype == dtype
+        tensor = create_data_tensor([dataset.data[:, :10], dataset.data[:, :10]],
+                                    dataset.data.dtype)
+        assert tensor.dtype == dtype
+
+
+def test_settings_dtype_validation():
+    with pytest.raises(AttributeError):
+        Settings('chemstation', dtype='int16')
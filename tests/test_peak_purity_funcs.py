@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 20:27:45 2026
+
+@author: haascp
+"""
+import numpy as np
+import pytest
+
+from mocca.peak.purity_funcs import (get_correls, get_agilent_thresholds,
+                                     get_max_loc)
+
+WAVELENGTH = np.arange(200., 400., 2.)
+
+
+def get_correls_loop(peak_data, max_loc):
+    return [(np.corrcoef(peak_data[:, i], peak_data[:, max_loc])[0, 1])**2
+            for i in range(peak_data.shape[1])]
+
+
+def get_agilent_thresholds_loop(peak_data, max_loc, noise_variance,
+                                param=2.5):
+    return [(max(0, 1 - param * (noise_variance / np.var(peak_data[:, i]) +
+                                 noise_variance /
+                                 np.var(peak_data[:, max_loc]))))**2
+            for i in range(peak_data.shape[1])]
+
+
+def create_peak_data(n_times, seed=0):
+    rng = np.random.default_rng(seed)
+    elution = np.exp(-np.linspace(-3, 3, n_times) ** 2)
+    spectra = [np.exp(-(WAVELENGTH - center) ** 2 / 200) for center in
+               [250, 290]]
+    peak_data = (np.outer(spectra[0], elution) +
+                 np.outer(spectra[1], np.roll(elution, n_times // 5)))
+    return peak_data + rng.normal(0, 0.01, peak_data.shape)
+
+
+@pytest.mark.parametrize("n_times", [1, 5, 200])
+@pytest.mark.parametrize("noise_variance", [1e-4, 1e-2, np.nan])
+def test_purity_funcs_equivalence(n_times, noise_variance):
+    peak_data = create_peak_data(n_times)
+    # constant spectrum
+    peak_data[:, 0] = 1.
+    max_loc = get_max_loc(peak_data)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected_correls = get_correls_loop(peak_data, max_loc)
+        expected_thresholds = get_agilent_thresholds_loop(peak_data, max_loc,
+                                                          noise_variance)
+    correls = get_correls(peak_data, max_loc)
+    thresholds = get_agilent_thresholds(peak_data, max_loc, noise_variance)
+    assert isinstance(correls, list) and isinstance(thresholds, list)
+    np.testing.assert_allclose(correls, expected_correls, rtol=1e-12)
+    np.testing.assert_allclose(thresholds, expected_thresholds, rtol=1e-12)
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:04:19 2026
+
+@author: haascp
+"""
+import numpy as np
+import pytest
+from sklearn.decomposition import PCA
+
+from mocca.peak.utils import get_explained_variance_ratios
+
+
+@pytest.mark.parametrize("shape", [(100, 8), (100, 60), (60, 100), (8, 100),
+                                   (30, 30)])
+def test_get_explained_variance_ratios(shape):
+    rng = np.random.default_rng(0)
+    # low rank data with noise as in peaks of few compounds
+    data = (rng.random((shape[0], 3)) @ rng.random((3, shape[1])) +
+            rng.normal(0, 0.01, shape))
+    ratios = get_explained_variance_ratios(data)
+    assert len(ratios) == min(shape)
+    assert np.all(np.diff(ratios) <= 1e-15)
+    assert np.sum(ratios) == pytest.approx(1)
+    n_components = min(min(shape), 10)
+    pca = PCA(n_components=n_components, svd_solver='full').fit(data)
+    np.testing.assert_allclose(ratios[:n_components],
+                               pca.explained_variance_ratio_, rtol=1e-6,
+                               atol=1e-12)